@@ -1,9 +1,10 @@
 """
 Intelligent Agent Entry Point
 """
+from concurrent.futures import ThreadPoolExecutor
 
 from config import DEFAULT_PROJECT_ROOT, AUTO_INSTALL, USE_CONDA, DEFAULT_TIMEOUT, DEEPSEEK_API_KEY, DEEPSEEK_BASE_URL, \
-    DEEPSEEK_MODEL
+    DEEPSEEK_MODEL, MAX_CONCURRENT_REQUESTS
 from project_generator import generate_initial_project, generate_error_project, generate_modify_project, \
     generate_project_project
 from code_runner import run_main_web_app, run_main_as_console_app, _kill_process_tree
@@ -37,6 +38,27 @@ def generate_project(code_mission, project_root=None, api_key=None,
     return result
 
 
+def generate_projects_batch(code_missions, max_workers=None, **kwargs):
+    """
+    Generate one project per mission concurrently, results in mission order
+    The work is almost all waiting on the LLM, so threads overlap it; at most
+    max_workers (default MAX_CONCURRENT_REQUESTS) missions are in flight at once.
+    Other keyword arguments are passed to generate_project.
+    """
+    if not code_missions:
+        return []
+    max_workers = min(max_workers or MAX_CONCURRENT_REQUESTS, len(code_missions))
+
+    def _generate(code_mission):
+        try:
+            return generate_project(code_mission, **kwargs)
+        except Exception as e:
+            return {"success": False, "stage": "generation", "error": str(e)}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_generate, code_missions))
+
+
 def error_project(former_message, error_message, project_root=None, api_key=None,
                   base_url=None, model=None, auto_install=True,
                   use_conda=False, conda_env_name=None):
@@ -68,9 +90,11 @@ def error_project(former_message, error_message, project_root=None, api_key=None
 
 def modify_project(former_message, modify_message, project_root=None, api_key=None,
                    base_url=None, model=None, auto_install=True,
-                   use_conda=False, conda_env_name=None):
+                   use_conda=False, conda_env_name=None, project_structure=None):
     """
     Main function to fix a project
+    modify_message can also be a list of needs, which are handled in a single LLM round
+    project_structure is an already built directory tree (see prefetch_project_structure)
     """
 
     api_key = api_key or DEEPSEEK_API_KEY
@@ -89,7 +113,8 @@ def modify_project(former_message, modify_message, project_root=None, api_key=No
         model=model,
         auto_install=auto_install,
         use_conda=use_conda,
-        conda_env_name=conda_env_name
+        conda_env_name=conda_env_name,
+        project_structure=project_structure
     )
 
     return result
@@ -2,41 +2,190 @@
 AI related tool
 """
 
+import asyncio
+import contextlib
+import hashlib
+import importlib.util
 import json
+import os
 import re
-from openai import OpenAI
-from config import DEEPSEEK_API_KEY, DEEPSEEK_BASE_URL, DEEPSEEK_MODEL, DEFAULT_TEMPERATURE, MAX_TOKENS
+import tempfile
+import threading
+import time
+import httpx
+from openai import OpenAI, AsyncOpenAI, DefaultHttpxClient, APIError, APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+try:
+    import orjson
+except ImportError:
+    orjson = None
+from config import DEEPSEEK_API_KEY, DEEPSEEK_BASE_URL, DEEPSEEK_MODEL, DEFAULT_TEMPERATURE, MAX_TOKENS, \
+    STREAM_RESPONSE, MAX_CONCURRENT_REQUESTS, REQUEST_TIMEOUT, MAX_RETRIES, RETRY_BACKOFF, \
+    LLM_DISK_CACHE, LLM_CACHE_DIR, LLM_CACHE_TTL
+
+# Failures worth retrying: the same request is likely to succeed a moment later.
+# A stall or dropped connection while a stream is being read surfaces as a raw httpx error.
+_RETRYABLE_ERRORS = (APITimeoutError, APIConnectionError, RateLimitError, InternalServerError,
+                     httpx.TimeoutException, httpx.TransportError)
+
+_FENCE_RE = re.compile(r'```(?:json)?\s*(.*?)\s*```', re.DOTALL)
+_JSON_TOKEN_RE = re.compile(r'[{}"\\]')
+
+_CLIENTS = {}
+_CLIENTS_LOCK = threading.Lock()
+_HTTP_CLIENT = None
+
+
+def _get_client(api_key, base_url):
+    """
+    Return the shared OpenAI client for (api_key, base_url) so its connection pool is reused
+
+    All clients send their requests through one HTTP client, so switching api_key or model
+    endpoint on the same host keeps the open connection. It speaks HTTP/2 when h2 is installed.
+    """
+    global _HTTP_CLIENT
+    key = (api_key, base_url)
+    client = _CLIENTS.get(key)
+    if client is None:
+        with _CLIENTS_LOCK:
+            client = _CLIENTS.get(key)
+            if client is None:
+                if _HTTP_CLIENT is None:
+                    _HTTP_CLIENT = DefaultHttpxClient(http2=importlib.util.find_spec("h2") is not None)
+                client = OpenAI(api_key=api_key, base_url=base_url, max_retries=0, http_client=_HTTP_CLIENT)
+                _CLIENTS[key] = client
+    return client
+
+
+def _loads_json(text):
+    """
+    Parse JSON text, using orjson when it is installed
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either the same way.
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+class _JsonBlockScanner:
+    """
+    Incremental brace scanner: feed text piece by piece and get back every balanced
+    top-level {...} block as soon as its closing brace arrives
+
+    Braces inside JSON strings (respecting escapes) don't count, so nested
+    objects come out whole instead of being cut at the first closing brace.
+    With level=2 the objects one level down (e.g. the out_file entries) are returned instead.
+    """
+
+    def __init__(self, level=1):
+        self._level = level
+        self._depth = 0
+        self._in_string = False
+        self._escaped_index = -1
+        self._offset = 0
+        self._block_parts = []
+
+    def feed(self, text):
+        blocks = []
+        block_start = 0
+
+        # Only these characters change the state, let the regex engine skip the rest
+        for match in _JSON_TOKEN_RE.finditer(text):
+            i = match.start()
+            if self._offset + i == self._escaped_index:
+                continue
+            char = match.group()
+
+            if self._in_string:
+                if char == '\\':
+                    self._escaped_index = self._offset + i + 1
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                # Quotes only open a string inside an object, prose around it is ignored
+                self._in_string = self._depth > 0
+            elif char == '{':
+                if self._depth == self._level - 1:
+                    block_start = i
+                self._depth += 1
+            elif char == '}' and self._depth:
+                self._depth -= 1
+                if self._depth == self._level - 1:
+                    self._block_parts.append(text[block_start:i + 1])
+                    blocks.append("".join(self._block_parts))
+                    self._block_parts = []
+
+        # Keep the unfinished block for the next piece
+        if self._depth >= self._level:
+            self._block_parts.append(text[block_start:])
+        self._offset += len(text)
+        return blocks
+
+
+class _StreamedJsonParser:
+    """
+    on_token consumer that parses the first JSON object of a streamed reply the moment
+    its closing brace arrives, so parsing overlaps with the tail of the stream
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.result = None
+        self._scanner = _JsonBlockScanner()
+
+    def __call__(self, piece):
+        if piece is None:
+            # A retried request delivers the reply again from the start
+            self.reset()
+            return
+        if self.result is not None:
+            return
+        for block in self._scanner.feed(piece):
+            try:
+                self.result = _loads_json(block)
+                return
+            except json.JSONDecodeError:
+                continue
+
+
+def _find_json_blocks(text):
+    """
+    Yield every balanced top-level {...} block of text in one linear scan
+    """
+    yield from _JsonBlockScanner().feed(text)
 
 
-def extract_json_from_response(response_text):
+def extract_json_from_response(response_text, already_json=False):
     """
     Extract JSON content from AI response
+
+    already_json: the reply was requested with response_format json_object, so it is bare
+    JSON; it is parsed once and the search for fenced or embedded blocks is skipped
     """
     if not response_text:
         return "no_json", None
 
     try:
-        json_data = json.loads(response_text)
+        json_data = _loads_json(response_text)
         return "success", json_data
     except json.JSONDecodeError:
-        pass
+        if already_json:
+            return "no_json", response_text
 
-    pattern = r'```(?:json)?\s*(.*?)\s*```'
-    matches = re.findall(pattern, response_text, re.DOTALL)
+    matches = _FENCE_RE.findall(response_text)
 
     for match in matches:
         try:
-            json_data = json.loads(match.strip())
+            json_data = _loads_json(match.strip())
             return "success", json_data
         except json.JSONDecodeError:
             continue
 
-    brace_pattern = r'(\{.*?\})'
-    matches = re.findall(brace_pattern, response_text, re.DOTALL)
-
-    for match in matches:
+    for block in _find_json_blocks(response_text):
         try:
-            json_data = json.loads(match)
+            json_data = _loads_json(block)
             return "success", json_data
         except json.JSONDecodeError:
             continue
@@ -44,21 +193,95 @@ def extract_json_from_response(response_text):
     return "no_json", response_text
 
 
+def _disk_cache_path(base_url, model, messages):
+    """
+    Disk cache file for a JSON request, or None when the disk cache is off.
+    Only role and content of each message are part of the key.
+    """
+    if not LLM_DISK_CACHE or os.environ.get("CODING_AGENT_NO_CACHE"):
+        return None
+    normalized = [{"role": m.get("role"), "content": m.get("content")} for m in messages]
+    payload = json.dumps([base_url, model, normalized], ensure_ascii=False, sort_keys=True)
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return os.path.join(os.path.expanduser(LLM_CACHE_DIR), digest + ".txt")
+
+
+def _disk_cache_get(path):
+    try:
+        if time.time() - os.stat(path).st_mtime > LLM_CACHE_TTL:
+            return None
+        with open(path, 'rb') as f:
+            return f.read().decode("utf-8")
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _disk_cache_put(path, response):
+    """Store a reply atomically; the cache is best effort, so failures are ignored"""
+    try:
+        cache_dir = os.path.dirname(path)
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(response.encode("utf-8"))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass
+
+
+def _iter_sse_content(lines):
+    """
+    Yield the non-empty content deltas from the server-sent event lines of a streamed completion
+    """
+    for line in lines:
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            break
+        event = _loads_json(data)
+        if "error" in event:
+            raise APIError(str(event["error"]), request=None, body=event["error"])
+        choices = event.get("choices")
+        if not choices:
+            continue
+        piece = (choices[0].get("delta") or {}).get("content")
+        if piece:
+            yield piece
+
+
 def get_raw_ai_response(messages,
                         api_key=None,
                         base_url=None,
                         model=None,
                         temperature=None,
                         max_tokens=None,
-                        response_type='text'):
+                        response_type='text',
+                        stream=None,
+                        on_token=None,
+                        request_timeout=None,
+                        max_retries=None):
     """
     Simple API call returning raw response
+
+    When streaming, the reply is assembled from the incremental deltas and every
+    non-empty piece is handed to on_token (if given) as soon as it arrives.
+    Timeouts, dropped connections, rate limits and server errors are retried with
+    exponential backoff; before a retry re-delivers tokens, on_token(None) is called
+    so the callback can discard the partial reply.
     """
     api_key = api_key or DEEPSEEK_API_KEY
     base_url = base_url or DEEPSEEK_BASE_URL
     model = model or DEEPSEEK_MODEL
     temperature = temperature or DEFAULT_TEMPERATURE
     max_tokens = max_tokens or MAX_TOKENS
+    stream = STREAM_RESPONSE if stream is None else stream
+    request_timeout = request_timeout or REQUEST_TIMEOUT
+    max_retries = MAX_RETRIES if max_retries is None else max_retries
 
     if not api_key:
         return "error", "API key not provided"
@@ -67,27 +290,166 @@ def get_raw_ai_response(messages,
     if response_type == 'json_object':
         extra_params['response_format'] = {"type": "json_object"}
 
-    client = OpenAI(
-        api_key=api_key,
-        base_url=base_url
-    )
+    return _request_ai_response(messages, api_key, base_url, model, temperature, max_tokens,
+                                stream, on_token, request_timeout, max_retries, extra_params)
 
-    try:
-        response = client.chat.completions.create(
-            model=model,
-            messages=messages,
-            stream=False,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            **extra_params
-        )
 
-        full_response = response.choices[0].message.content
-        return "success", full_response.strip()
+def _request_ai_response(messages, api_key, base_url, model, temperature, max_tokens,
+                         stream, on_token, request_timeout, max_retries, extra_params):
+    client = _get_client(api_key, base_url)
+
+    for attempt in range(max_retries + 1):
+        if attempt:
+            delay = RETRY_BACKOFF * 2 ** (attempt - 1)
+            print(f"API request failed ({last_error}), retrying in {delay}s...")
+            time.sleep(delay)
+            if on_token:
+                on_token(None)
+
+        try:
+            if not stream:
+                response = client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    timeout=request_timeout,
+                    **extra_params
+                )
+                full_response = response.choices[0].message.content
+                return "success", full_response.strip()
+
+            # Read the raw event stream instead of letting the SDK build a model per chunk
+            parts = []
+            with client.chat.completions.with_streaming_response.create(
+                model=model,
+                messages=messages,
+                stream=True,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                timeout=request_timeout,
+                **extra_params
+            ) as response:
+                for piece in _iter_sse_content(response.iter_lines()):
+                    parts.append(piece)
+                    if on_token:
+                        on_token(piece)
+            return "success", "".join(parts).strip()
+
+        except _RETRYABLE_ERRORS as e:
+            last_error = e
+
+        except Exception as e:
+            error_msg = f"API error: {str(e)}"
+            return "error", error_msg
+
+    error_msg = f"API error: {str(last_error)}"
+    return "error", error_msg
+
+
+async def get_raw_ai_response_async(messages,
+                                    api_key=None,
+                                    base_url=None,
+                                    model=None,
+                                    temperature=None,
+                                    max_tokens=None,
+                                    response_type='text',
+                                    client=None,
+                                    semaphore=None,
+                                    request_timeout=None,
+                                    max_retries=None):
+    """
+    Async counterpart of get_raw_ai_response, returns the same (status, content) tuple
+
+    Without a client, one is opened for this call and closed afterwards; pass the client (and a
+    semaphore limiting concurrency) shared by a batch, as get_raw_ai_responses does.
+    """
+    api_key = api_key or DEEPSEEK_API_KEY
+    base_url = base_url or DEEPSEEK_BASE_URL
+    model = model or DEEPSEEK_MODEL
+    temperature = temperature or DEFAULT_TEMPERATURE
+    max_tokens = max_tokens or MAX_TOKENS
+    request_timeout = request_timeout or REQUEST_TIMEOUT
+    max_retries = MAX_RETRIES if max_retries is None else max_retries
+
+    if not api_key:
+        return "error", "API key not provided"
+
+    extra_params = {}
+    if response_type == 'json_object':
+        extra_params['response_format'] = {"type": "json_object"}
+
+    if client is None:
+        async with AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0) as client:
+            return await get_raw_ai_response_async(messages, api_key=api_key, base_url=base_url, model=model,
+                                                   temperature=temperature, max_tokens=max_tokens,
+                                                   response_type=response_type, client=client,
+                                                   semaphore=semaphore, request_timeout=request_timeout,
+                                                   max_retries=max_retries)
+    # A single call has nothing to share a limit with
+    semaphore = semaphore or contextlib.nullcontext()
+
+    for attempt in range(max_retries + 1):
+        if attempt:
+            await asyncio.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+
+        try:
+            async with semaphore:
+                response = await asyncio.wait_for(
+                    client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        stream=False,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                        **extra_params
+                    ),
+                    timeout=request_timeout
+                )
+
+            full_response = response.choices[0].message.content
+            return "success", full_response.strip()
+
+        except (asyncio.TimeoutError, *_RETRYABLE_ERRORS) as e:
+            last_error = e
+
+        except Exception as e:
+            error_msg = f"API error: {str(e)}"
+            return "error", error_msg
+
+    error_msg = f"API error: {str(last_error) or 'request timed out'}"
+    return "error", error_msg
+
+
+def get_raw_ai_responses(messages_list,
+                         api_key=None,
+                         base_url=None,
+                         model=None,
+                         temperature=None,
+                         max_tokens=None,
+                         response_type='text',
+                         max_concurrency=None):
+    """
+    Run independent API calls concurrently, results keep the order of messages_list
+    """
+    api_key = api_key or DEEPSEEK_API_KEY
+    base_url = base_url or DEEPSEEK_BASE_URL
+    max_concurrency = max_concurrency or MAX_CONCURRENT_REQUESTS
+
+    async def _gather():
+        # One client and one semaphore per batch: both are bound to the running event loop
+        semaphore = asyncio.Semaphore(max_concurrency)
+        async with AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0) as client:
+            return await asyncio.gather(*[
+                get_raw_ai_response_async(messages, api_key=api_key, base_url=base_url, model=model,
+                                          temperature=temperature, max_tokens=max_tokens,
+                                          response_type=response_type, client=client, semaphore=semaphore)
+                for messages in messages_list
+            ])
 
-    except Exception as e:
-        error_msg = f"API error: {str(e)}"
-        return "error", error_msg
+    if not api_key:
+        return [("error", "API key not provided") for _ in messages_list]
+    return asyncio.run(_gather())
 
 
 def modify_prompt(user_mission, max_tokens=8100, api_key=None, base_url=None, model=None):
@@ -120,17 +482,9 @@ Please output the prompt directly."""
         return "success", response
 
 
-def get_first_response(code_mission, api_key=None, base_url=None, model=None):
-    """
-    Get the complete project structure at once, including project_folder_name
-    """
-    api_key = api_key or DEEPSEEK_API_KEY
-    base_url = base_url or DEEPSEEK_BASE_URL
-    model = model or DEEPSEEK_MODEL
-
-    complete_prompt = f"""You are an experienced software architect. Here is a program task:
-
-{code_mission}
+# Constant instructions go first, in a system message that is byte-identical across calls,
+# so the provider's prefix cache can skip re-processing them. Variable text goes after it.
+_GENERATION_SYSTEM_PROMPT = """You are an experienced software architect. The user will give you a program task.
 
 Break down the task, and write robust code.
 With Python as the primary programming language, you need to generate a complete project structure, including the file hierarchy and the full code for each file. Please note that the final file to run is main.py, so the main file must be named main.py.
@@ -139,6 +493,7 @@ With Python as the primary programming language, you need to generate a complete
 1. Based on the project type, you must specify in the "project_type" field:
    - If it's a web application (e.g., Flask, Django, FastAPI, etc.), use "web"
    - If it's a command-line tool, script, desktop application, etc., use "python"
+   - For a Flask application, create the app object at module level in main.py (e.g. `app = Flask(__name__)`) and start the development server only under `if __name__ == '__main__':`, so the app can also be served by a WSGI server such as gunicorn. Put any other setup (creating folders, initialising the database, ...) at module level too, since a WSGI server never runs the `__main__` block. Do not turn on debug mode or template auto-reload (`app.config['TEMPLATES_AUTO_RELOAD'] = False`)
 
 2. You need to assign an appropriate folder name for this project in the "project_folder_name" field.
    - The name should be concise, meaningful, and use lowercase letters, numbers, and underscores.
@@ -147,34 +502,148 @@ With Python as the primary programming language, you need to generate a complete
 3. In the "description" field, please provide a detailed record of the core information of the code.
 
 You output should strictly follow the json format. Below is an example:
-{{
+{
     "project_folder_name": "code_mission",  // folder name for the project
     "project_type": "web",  // or "python". choose it based on the type of the project.
     "out_file": [
-        {{
+        {
             "file_name": "main.py",
             "operation": "write",  //if you want to modify the code or add new file, choose "write". if you want to delete the file, choose "delete", and you can leave "code" empty.
             "description": "Main program file, containing the program entry point and main logic...",  // Do not write what you have added, but what is this code about right now.
             "code": "Complete Python code, including import, function definition and main function etc."
-        }},
-        {{
+        },
+        {
             "file_name": "requirements.txt",
             "operation": "write",
             "description": "……",
             "code": "……"
-        }},
-        {{
+        },
+        {
             "file_name": "sub_folder/code.py",
             "operation": "write",
             "description": "……",
             "code": "Complete Python code……"
-        }}
+        }
     ]
-}}"""
+}"""
 
-    messages = [
-        {"role": "user", "content": complete_prompt}
+
+_PROJECT_SYSTEM_PROMPT = """You are an experienced software architect. The user will give you the structure of a project and some modifications that you need to make to that project.
+Remember to keep the original style and layout unchanged, so read necessary files before writing.
+Whenever you think you need more information, choose to read.
+When you think you have gathered enough information, you can write code.
+**IMPORTANT**
+1. Based on the project type, you must specify in the "project_type" field:
+   - If it's a web application (e.g., Flask, Django, FastAPI, etc.), use "web"
+   - If it's a command-line tool, script, desktop application, etc., use "python"
+2. In the "description" field, please provide a detailed record of the core information of the code you write.
+3. Only make necessary changes, especially don't change the style and layout of the frontend only when you are told to do so. So remember to read the core codes before writing.
+4. You can choose to write and delete at the same time, but you can't choose to read and write or to read and delete.  
+5. If you need to read, request every file you will need in that one reply instead of reading one file per round.
+
+
+You output should strictly follow the json format. READ AND WRITE USE THE SAME FORMAT. Below are two examples:
+FOR READ:
+{
+    "project_folder_name": "code_mission",  // folder name of the project
+    "project_type": "web",  // or "python". choose it based on the type of the project.
+    "out_file": [
+        {
+            "file_name": "main.py",
+            "operation": "read",  //if you want to modify the code or add a new file, choose "write". if you want to delete or read the file, choose "delete" / "read", and you can leave "description" and "code" empty.
+            "description": ".
+            "code": ""
+        },
+        {
+            "file_name": "requirements.txt",
+            "operation": "read",
+            "description": "……",
+            "code": "……"
+        },
+        {
+            "file_name": "sub_folder/code.py",
+            "operation": "read",
+            "description": "……",
+            "code": "Complete Python code……"
+        }
+    ]
+}
+
+FOR WRITE:
+{
+    "project_folder_name": "code_mission",  // folder name of the project
+    "project_type": "web",  // or "python". choose it based on the type of the project.
+    "out_file": [
+        {
+            "file_name": "main.py",
+            "operation": "write",  //if you want to modify the code or add a new file, choose "write". if you want to delete or read the file, choose "delete" / "read", and you can leave "description" and "code" empty.
+            "description": "Main program file, containing the program entry point and main logic...",  // Do not write what you have added, but what is this code about right now.
+            "code": "Complete Python code, including import, function definition and main function etc."
+        },
+        {
+            "file_name": "requirements.txt",
+            "operation": "write",
+            "description": "……",
+            "code": "……"
+        },
+        {
+            "file_name": "sub_folder/code.py",
+            "operation": "write",
+            "description": "……",
+            "code": "Complete Python code……"
+        }
     ]
+}
+Remember: READ FIRST, WRITE LATER"""
+
+
+def _ensure_system_prompt(messages, system_prompt=_GENERATION_SYSTEM_PROMPT):
+    """
+    Make sure a conversation starts with a system message, keeping the cached prefix stable
+    """
+    if not messages or messages[0].get("role") != "system":
+        messages.insert(0, {"role": "system", "content": system_prompt})
+    return messages
+
+
+def _get_json_response(messages, api_key, base_url, model, on_item=None):
+    """
+    Request a JSON reply, parsing it while it streams in
+
+    on_item, if given, is called with each out_file entry as soon as that entry has streamed in,
+    so the caller can start on it (e.g. read a requested file) before the reply is complete.
+
+    With LLM_DISK_CACHE on, replies that parsed are kept on disk (see _disk_cache_path), so
+    replaying an identical conversation skips the model call; on_item still sees every entry.
+
+    Returns (status, json_data or error message, raw response text)
+    """
+    cache_path = _disk_cache_path(base_url, model, messages)
+    if cache_path:
+        cached = _disk_cache_get(cache_path)
+        if cached is not None:
+            json_status, json_data = extract_json_from_response(cached, already_json=True)
+            if json_status == "success":
+                if on_item is not None and isinstance(json_data, dict):
+                    for item in json_data.get("out_file") or []:
+                        on_item(item)
+                return "success", json_data, cached
+
+    parser = _StreamedJsonParser()
+    on_token = parser
+    if on_item is not None:
+        item_scanner = [_JsonBlockScanner(level=2)]
+
+        def on_token(piece):
+            parser(piece)
+            if piece is None:
+                item_scanner[0] = _JsonBlockScanner(level=2)
+                return
+            for block in item_scanner[0].feed(piece):
+                try:
+                    on_item(_loads_json(block))
+                except json.JSONDecodeError:
+                    continue
 
     status, response = get_raw_ai_response(
         messages=messages,
@@ -182,27 +651,76 @@ You output should strictly follow the json format. Below is an example:
         base_url=base_url,
         model=model,
         temperature=0,
-        response_type='json_object'
+        response_type='json_object',
+        on_token=on_token
     )
 
     if status == "error":
-        return "error", response, messages
+        return "error", response, None
+
+    if parser.result is not None:
+        if cache_path:
+            _disk_cache_put(cache_path, response)
+        return "success", parser.result, response
 
-    json_status, json_data = extract_json_from_response(response)
+    json_status, json_data = extract_json_from_response(response, already_json=True)
 
     if json_status == "success":
-        messages.append({"role": "assistant", "content": response})
-        return "success", json_data, messages
+        if cache_path:
+            _disk_cache_put(cache_path, response)
+        return "success", json_data, response
     else:
         error_msg = f"can't recognize as JSON: {json_data}"
-        return "error", error_msg, messages
+        return "error", error_msg, response
+
+
+def get_first_response(code_mission, api_key=None, base_url=None, model=None):
+    """
+    Get the complete project structure at once, including project_folder_name
+    """
+    api_key = api_key or DEEPSEEK_API_KEY
+    base_url = base_url or DEEPSEEK_BASE_URL
+    model = model or DEEPSEEK_MODEL
+
+    messages = [
+        {"role": "system", "content": _GENERATION_SYSTEM_PROMPT},
+        {"role": "user", "content": f"""Here is a program task:
+
+{code_mission}"""}
+    ]
+
+    status, json_data, response = _get_json_response(messages, api_key, base_url, model)
+
+    if status == "success":
+        messages.append({"role": "assistant", "content": response})
+    return status, json_data, messages
+
+
+def _structure_prompt(project_structure):
+    """
+    Prompt suffix with the current project tree, asking for all needed reads in a single reply
+    """
+    if not project_structure:
+        return ""
+    return f"""
+Here is the current structure of the project:
+{project_structure}
+If you need to read existing files before writing, request all of them in this one reply instead of one at a time."""
 
 
 def get_error_response(former_message, error_message, api_key=None,
                        base_url=None,
-                       model=None):
+                       model=None,
+                       code_detail=None,
+                       project_structure=None,
+                       on_item=None):
     """
     Fix project error messages
+
+    code_detail carries the current code of the files named in the traceback, so the
+    model can write the fix directly instead of spending a round on reading them.
+    project_structure (the current directory tree) lets it ask for any other files in one go.
+    on_item is passed on to _get_json_response.
     """
     api_key = api_key or DEEPSEEK_API_KEY
     base_url = base_url or DEEPSEEK_BASE_URL
@@ -212,32 +730,26 @@ def get_error_response(former_message, error_message, api_key=None,
 {error_message}
 Please identify which files need to be modified, and write code for the related files.
 Note: Every single code should be complete, not just pieces of it, and your output should follow the previous json format."""
+    if code_detail:
+        complete_prompt += f"""
+Here is the current code of the files in the traceback, you don't need to read them again:
+{code_detail}"""
+    complete_prompt += _structure_prompt(project_structure)
 
+    _ensure_system_prompt(former_message)
     former_message.append({"role": "user", "content": complete_prompt})
-    status, response = get_raw_ai_response(
-        messages=former_message,
-        api_key=api_key,
-        base_url=base_url,
-        model=model,
-        temperature=0,
-        response_type='json_object'
-    )
-    if status == "error":
-        return "error", response, former_message
-
-    json_status, json_data = extract_json_from_response(response)
+    status, json_data, response = _get_json_response(former_message, api_key, base_url, model, on_item)
 
-    if json_status == "success":
+    if status == "success":
         former_message.append({"role": "assistant", "content": response})
-        return "success", json_data, former_message
-    else:
-        error_msg = f"can't recognize as JSON: {json_data}"
-        return "error", error_msg, former_message
+    return status, json_data, former_message
 
 
 def get_modify_response(former_message, modify_message, api_key=None,
                         base_url=None,
-                        model=None):
+                        model=None,
+                        project_structure=None,
+                        on_item=None):
     """
     modify based on users input
     """
@@ -249,131 +761,68 @@ def get_modify_response(former_message, modify_message, api_key=None,
 {modify_message}
 please identify which files need to be modified, and write code for the related files.
 Note: Every single code should be complete, not just pieces of it, and your output should follow the previous json format."""
+    complete_prompt += _structure_prompt(project_structure)
 
+    _ensure_system_prompt(former_message)
     former_message.append({"role": "user", "content": complete_prompt})
-    status, response = get_raw_ai_response(
-        messages=former_message,
+    status, json_data, response = _get_json_response(former_message, api_key, base_url, model, on_item)
+
+    if status == "success":
+        former_message.append({"role": "assistant", "content": response})
+    return status, json_data, former_message
+
+
+def get_batch_modify_response(former_message, modify_messages, api_key=None,
+                              base_url=None,
+                              model=None,
+                              project_structure=None,
+                              on_item=None):
+    """
+    Handle several modification needs in one round instead of one round per need
+    """
+    numbered = "\n".join(f"{i}. {message}" for i, message in enumerate(modify_messages, 1))
+    batch_message = f"""{numbered}
+Handle all of the needs above in this one reply. When several needs touch the same file, merge them into a single entry for that file."""
+
+    return get_modify_response(
+        former_message=former_message,
+        modify_message=batch_message,
         api_key=api_key,
         base_url=base_url,
         model=model,
-        temperature=0,
-        response_type='json_object'
+        project_structure=project_structure,
+        on_item=on_item
     )
-    if status == "error":
-        return "error", response, former_message
-
-    json_status, json_data = extract_json_from_response(response)
-
-    if json_status == "success":
-        former_message.append({"role": "assistant", "content": response})
-        return "success", json_data, former_message
-    else:
-        error_msg = f"can't recognize as JSON: {json_data}"
-        return "error", error_msg, former_message
 
 
-def get_project_response(code_mission, project_structure, api_key=None, base_url=None, model=None):
+def get_project_response(code_mission, project_structure, api_key=None, base_url=None, model=None,
+                         code_detail=None, on_item=None):
     api_key = api_key or DEEPSEEK_API_KEY
     base_url = base_url or DEEPSEEK_BASE_URL
     model = model or DEEPSEEK_MODEL
 
-    complete_prompt = f"""You are an experienced software architect. Here is the structure of a project:
-{project_structure}
-
-Here are some modifications that you need to make to that project:
-{code_mission}
-Remember to keep the original style and layout unchanged, so read necessary files before writing.
-Whenever you think you need more information, choose to read.
-When you think you have gathered enough information, you can write code.
-**IMPORTANT**
-1. Based on the project type, you must specify in the "project_type" field:
-   - If it's a web application (e.g., Flask, Django, FastAPI, etc.), use "web"
-   - If it's a command-line tool, script, desktop application, etc., use "python"
-2. In the "description" field, please provide a detailed record of the core information of the code you write.
-3. Only make necessary changes, especially don't change the style and layout of the frontend only when you are told to do so. So remember to read the core codes before writing.
-4. You can choose to write and delete at the same time, but you can't choose to read and write or to read and delete.  
-
-
-You output should strictly follow the json format. READ AND WRITE USE THE SAME FORMAT. Below are two examples:
-FOR READ:
-{{
-    "project_folder_name": "code_mission",  // folder name of the project
-    "project_type": "web",  // or "python". choose it based on the type of the project.
-    "out_file": [
-        {{
-            "file_name": "main.py",
-            "operation": "read",  //if you want to modify the code or add a new file, choose "write". if you want to delete or read the file, choose "delete" / "read", and you can leave "description" and "code" empty.
-            "description": ".
-            "code": ""
-        }},
-        {{
-            "file_name": "requirements.txt",
-            "operation": "read",
-            "description": "……",
-            "code": "……"
-        }},
-        {{
-            "file_name": "sub_folder/code.py",
-            "operation": "read",
-            "description": "……",
-            "code": "Complete Python code……"
-        }}
-    ]
-}}
-
-FOR WRITE:
-{{
-    "project_folder_name": "code_mission",  // folder name of the project
-    "project_type": "web",  // or "python". choose it based on the type of the project.
-    "out_file": [
-        {{
-            "file_name": "main.py",
-            "operation": "write",  //if you want to modify the code or add a new file, choose "write". if you want to delete or read the file, choose "delete" / "read", and you can leave "description" and "code" empty.
-            "description": "Main program file, containing the program entry point and main logic...",  // Do not write what you have added, but what is this code about right now.
-            "code": "Complete Python code, including import, function definition and main function etc."
-        }},
-        {{
-            "file_name": "requirements.txt",
-            "operation": "write",
-            "description": "……",
-            "code": "……"
-        }},
-        {{
-            "file_name": "sub_folder/code.py",
-            "operation": "write",
-            "description": "……",
-            "code": "Complete Python code……"
-        }}
-    ]
-}}
-Remember: READ FIRST, WRITE LATER"""
+    # Files sent up front (e.g. main.py) save the model a read round before it can write
+    prefetched_prompt = f"""
+Here is the code of some files you would read first anyway, you don't need to read them again:
+{code_detail}
+""" if code_detail else ""
 
     messages = [
-        {"role": "user", "content": complete_prompt}
+        {"role": "system", "content": _PROJECT_SYSTEM_PROMPT},
+        {"role": "user", "content": f"""Here is the structure of a project:
+{project_structure}
+{prefetched_prompt}
+Here are some modifications that you need to make to that project:
+{code_mission}"""}
     ]
-    status, response = get_raw_ai_response(
-        messages=messages,
-        api_key=api_key,
-        base_url=base_url,
-        model=model,
-        temperature=0,
-        response_type='json_object'
-    )
-
-    if status == "error":
-        return "error", response, messages
-
-    json_status, json_data = extract_json_from_response(response)
+    status, json_data, response = _get_json_response(messages, api_key, base_url, model, on_item)
 
-    if json_status == "success":
+    if status == "success":
         messages.append({"role": "assistant", "content": response})
-        return "success", json_data, messages
-    else:
-        error_msg = f"can't recognize as JSON: {json_data}"
-        return "error", error_msg, messages
+    return status, json_data, messages
 
 
-def code_detail_feedback(former_message, code_detail, api_key=None, base_url=None, model=None):
+def code_detail_feedback(former_message, code_detail, api_key=None, base_url=None, model=None, on_item=None):
     api_key = api_key or DEEPSEEK_API_KEY
     base_url = base_url or DEEPSEEK_BASE_URL
     model = model or DEEPSEEK_MODEL
@@ -386,23 +835,8 @@ Use the previously mentioned json format.
 """
 
     former_message.append({"role": "user", "content": complete_prompt})
-    status, response = get_raw_ai_response(
-        messages=former_message,
-        api_key=api_key,
-        base_url=base_url,
-        model=model,
-        temperature=0,
-        response_type='json_object'
-    )
-
-    if status == "error":
-        return "error", response, former_message
+    status, json_data, response = _get_json_response(former_message, api_key, base_url, model, on_item)
 
-    json_status, json_data = extract_json_from_response(response)
-
-    if json_status == "success":
+    if status == "success":
         former_message.append({"role": "assistant", "content": response})
-        return "success", json_data, former_message
-    else:
-        error_msg = f"can't recognize as JSON: {json_data}"
-        return "error", error_msg, former_message
+    return status, json_data, former_message
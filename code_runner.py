@@ -1,13 +1,23 @@
 """
 Code Runner Module
 """
+import queue
+import threading
 import subprocess
 import time
 import sys
 import os
 import traceback
 
-from web_utils import _start_web_process, _open_browser_if_needed, _kill_process_tree, _is_port_open, _create_output_reader_thread
+from web_utils import _start_web_process, _open_browser_if_needed, _kill_process_tree, _find_open_port, \
+    _create_output_reader_thread
+
+# Start of a Python traceback in the server output
+_TB_MARKER = "Traceback (most recent call last)"
+
+# Longest blocking wait in the server monitor loop; Windows only delivers Ctrl+C
+# to a thread blocked on a lock once its wait times out
+_MONITOR_WAKE = 1 if os.name == "nt" else None
 
 
 def execute_python_code(filepath, timeout=None, input_text=None):
@@ -76,33 +86,50 @@ def run_web_server(filepath, open_browser=True, max_wait=15):
 
     process = _start_web_process(abs_filepath)
     output_lines = []
-    _create_output_reader_thread(process, output_lines)
+    line_queue = queue.Queue()
+    started = threading.Event()
+    url_container = {}
+    _create_output_reader_thread(process, output_lines, line_queue, started, url_container)
 
     default_ports = [5000, 8000, 8080, 3000, 8501]
-    waited, poll = 0, 0.2
+    deadline = time.time() + max_wait
+    # Probe quickly at first, then back off: 10 ms doubling up to 0.5 s between probes
+    delay = 0.01
     server_url = None
 
-    while waited < max_wait:
+    while time.time() < deadline:
         if process.poll() is not None:
             return {"success": False, "error": "Server exited unexpectedly", "process": process,
-                    "output_lines": output_lines}
-
-        for p in default_ports:
-            if _is_port_open("127.0.0.1", p):
-                server_url = f"http://127.0.0.1:{p}"
+                    "output_lines": output_lines, "line_queue": line_queue}
+
+        if started.is_set():
+            # The server printed its address; confirm it is accepting connections, still
+            # checking the usual ports in case the announced one is not where it listens
+            announced_port = int(url_container["server_url"].rsplit(":", 1)[1])
+            port = _find_open_port("127.0.0.1", [announced_port] + default_ports)
+            if port:
+                server_url = f"http://127.0.0.1:{port}"
                 break
-        if server_url:
+            time.sleep(delay)
+            delay = min(delay * 2, 0.5)
+            continue
+
+        port = _find_open_port("127.0.0.1", default_ports)
+        if port:
+            server_url = f"http://127.0.0.1:{port}"
             break
 
-        time.sleep(poll)
-        waited += poll
+        # Probe the usual ports only if no address shows up in the output
+        started.wait(delay)
+        delay = min(delay * 2, 0.5)
 
     if not server_url:
         return {"success": False, "error": "Server did not start in time", "process": process,
-                "output_lines": output_lines}
+                "output_lines": output_lines, "line_queue": line_queue}
 
     _open_browser_if_needed(server_url, open_browser)
-    return {"success": True, "process": process, "url": server_url, "output_lines": output_lines}
+    return {"success": True, "process": process, "url": server_url, "output_lines": output_lines,
+            "line_queue": line_queue}
 
 
 # ---------------- Run main.py ----------------
@@ -120,26 +147,52 @@ def run_main_web_app(main_path, open_browser=True, run_timeout=None, result_cont
         return False
 
     process = server_info["process"]
-    output_lines = server_info["output_lines"]
+    line_queue = server_info["line_queue"]
     server_url = server_info.get("url")
 
     print(f"Server running at: {server_url}")
     print("Press Ctrl+C to stop the server.")
 
-    last_len = 0
-    start_time = time.time()
+    deadline = time.time() + run_timeout if run_timeout else None
+    output_open = True
 
     try:
         while True:
-            # capture new output
-            new_lines = output_lines[last_len:]
-            last_len = len(output_lines)
-            for i, line in enumerate(new_lines):
-                if "Traceback (most recent call last)" in line:
-                    tb = "\n".join(new_lines[i:])
-                    result_container["server_error"] = tb
-                    _kill_process_tree(process)
-                    return False
+            # Block until the server prints a line, its output ends or the deadline passes
+            timeout = _MONITOR_WAKE
+            if deadline is not None:
+                remaining = max(deadline - time.time(), 0)
+                timeout = remaining if timeout is None else min(timeout, remaining)
+
+            line = None
+            if output_open:
+                try:
+                    line = line_queue.get(timeout=timeout)
+                except queue.Empty:
+                    pass
+                else:
+                    # None marks the end of the output: the process is exiting
+                    output_open = line is not None
+            else:
+                try:
+                    process.wait(timeout=timeout)
+                except subprocess.TimeoutExpired:
+                    pass
+
+            if line is not None and _TB_MARKER in line:
+                # The rest of the traceback follows within moments, collect it before reporting
+                tb_lines = [line]
+                try:
+                    while True:
+                        next_line = line_queue.get(timeout=0.2)
+                        if next_line is None:
+                            break
+                        tb_lines.append(next_line)
+                except queue.Empty:
+                    pass
+                result_container["server_error"] = "\n".join(tb_lines)
+                _kill_process_tree(process)
+                return False
 
             # Subprocess exited unexpectedly
             if process.poll() is not None:
@@ -148,17 +201,15 @@ def run_main_web_app(main_path, open_browser=True, run_timeout=None, result_cont
                 return False
 
             # Timeout stop
-            if run_timeout and time.time() - start_time > run_timeout:
+            if deadline is not None and time.time() >= deadline:
                 print(f"Server ran for {run_timeout}s, stopping...")
                 _kill_process_tree(process)
                 return True
 
-            time.sleep(1)
-
     except KeyboardInterrupt:
         print("\nCtrl+C pressed, stopping server...")
-        if process.poll() is None:
-            _kill_process_tree(process)
+        # The server runs in its own process group, so Ctrl+C did not reach it
+        _kill_process_tree(process)
         return True
 
 
@@ -166,8 +217,6 @@ def run_main_as_console_app(main_path, run_timeout=None):
     """
     Run main.py as a real console application, preserving user interaction while capturing exception information.
     """
-    import tempfile
-
     print("\n" + "=" * 60)
     print("run main.py")
     print("=" * 60)
@@ -175,61 +224,44 @@ def run_main_as_console_app(main_path, run_timeout=None):
     abs_main = os.path.abspath(main_path)
     cwd = os.path.dirname(abs_main)
 
-    # temp file capture stderr
-    with tempfile.TemporaryFile(mode="w+", encoding="utf-8") as err_file:
-        process = subprocess.Popen(
+    try:
+        completed = subprocess.run(
             [sys.executable, abs_main],
             cwd=cwd,
             stdin=None,  # Inherit current console
             stdout=None,  # Inherit current console
-            stderr=err_file  # Write stderr to temporary file
+            stderr=subprocess.PIPE,  # Capture stderr for error reporting
+            timeout=run_timeout,
+            check=False
         )
+        ret = completed.returncode
 
-        start_time = time.time()
+        return {
+            "success": (ret == 0),
+            "returncode": ret,
+            "stdout": "",  # Direct console output
+            "stderr": completed.stderr.decode("utf-8", "replace"),
+            "error": None if ret == 0 else "failed to run",
+            "filepath": abs_main
+        }
 
-        try:
-            while True:
-                ret = process.poll()
-                if ret is not None:
-                    # Program exited, read stderr
-                    err_file.seek(0)
-                    stderr_content = err_file.read()
-
-                    return {
-                        "success": (ret == 0),
-                        "returncode": ret,
-                        "stdout": "",  # Direct console output
-                        "stderr": stderr_content,
-                        "error": None if ret == 0 else "failed to run",
-                        "filepath": abs_main
-                    }
-
-                if run_timeout and (time.time() - start_time) > run_timeout:
-                    process.kill()
-                    err_file.seek(0)
-                    stderr_content = err_file.read()
-
-                    return {
-                        "success": False,
-                        "error": f"time out{run_timeout}seconds. terminate now",
-                        "stdout": "",
-                        "stderr": stderr_content,
-                        "returncode": None,
-                        "filepath": abs_main
-                    }
-
-                time.sleep(0.1)
-
-        except Exception as e:
-            process.kill()
-            err_file.seek(0)
-            stderr_content = err_file.read()
+    except subprocess.TimeoutExpired as e:
+        # subprocess.run has already killed the program
+        return {
+            "success": False,
+            "error": f"time out{run_timeout}seconds. terminate now",
+            "stdout": "",
+            "stderr": (e.stderr or b"").decode("utf-8", "replace"),
+            "returncode": None,
+            "filepath": abs_main
+        }
 
-            return {
-                "success": False,
-                "error": str(e),
-                "stdout": "",
-                "stderr": stderr_content,
-                "returncode": None,
-                "filepath": abs_main
-            }
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "stdout": "",
+            "stderr": "",
+            "returncode": None,
+            "filepath": abs_main
+        }
@@ -15,4 +15,16 @@ AUTO_INSTALL = True
 USE_CONDA = False
 OPEN_BROWSER = True
 BROWSER_DELAY = 2
+USE_GUNICORN = False  # serve generated Flask apps with gunicorn (Unix, when installed) instead of app.run
+GUNICORN_PORT = 5000
+GUNICORN_WORKERS = 1  # worker processes; raise only for apps that keep no state in module globals
+GUNICORN_THREADS = 4
 MAX_TOKENS = 65536
+STREAM_RESPONSE = True  # receive completions token by token instead of one blocking reply
+MAX_CONCURRENT_REQUESTS = 8  # upper bound on LLM calls in flight at once
+REQUEST_TIMEOUT = 120  # seconds without data from the LLM before a request is abandoned
+MAX_RETRIES = 3
+RETRY_BACKOFF = 1  # seconds, doubled on every retry
+LLM_DISK_CACHE = False  # replay identical prompts from disk instead of asking the model again (for re-running a session); CODING_AGENT_NO_CACHE=1 overrides it
+LLM_CACHE_DIR = "~/.cache/coding_agent_llm"
+LLM_CACHE_TTL = 86400  # seconds a cached reply stays valid
@@ -4,15 +4,54 @@ Provides functionality for checking, resolving, and installing Python package de
 Supports reading dependencies from requirements.txt files and installing them using pip or conda
 """
 
+import asyncio
 import os
+import re
 import sys
 import subprocess
+import threading
+import importlib
 import importlib.metadata
+from collections import deque
+from functools import lru_cache
 import packaging.version
 import packaging.requirements
 import packaging.specifiers
+import packaging.utils
 
+# Upper bound on concurrent pip processes in install_requirements
+MAX_INSTALL_WORKERS = 8
 
+# Lines of installer stderr kept for error messages
+_STDERR_TAIL_LINES = 20
+
+# First character of any version comparison operator (==, >=, <=, !=, ~=, <, >)
+_OP_RE = re.compile(r'[=<>!~]')
+_OP_CHARS = frozenset('=<>!~')
+
+# Characters that only appear in specs needing the full PEP 508 parser
+# (operators, markers, extras, URL references)
+_SPEC_CHARS = _OP_CHARS | frozenset(';[@ ')
+
+# requirements.txt lines that are not package specifications
+_SKIP_RE = re.compile(r'#|-e|git\+|-i|--index-url|-f|--find-links')
+
+# Successful install_requirements results:
+# (path, st_mtime_ns, sys.prefix, use_conda, conda_env_name) -> result dict
+_RESULT_CACHE = {}
+
+# Canonical name -> installed version for the current environment (_LazyInstalledMap)
+_INSTALLED_MAP = None
+_INSTALLED_MAP_LOCK = threading.Lock()
+
+# Parsed requirements files: (path, st_mtime_ns) -> list of package specifications
+_REQ_CACHE = {}
+
+# PEP 503 normalized name ("Foo_Bar" -> "foo-bar"); the same names come up again and again
+_canonical_name = lru_cache(maxsize=4096)(packaging.utils.canonicalize_name)
+
+
+@lru_cache(maxsize=1024)
 def parse_package_name(package_spec):
     """
     Extract the pure package name from a package specification string (removing version constraints)
@@ -32,18 +71,26 @@ def parse_package_name(package_spec):
     # Remove leading/trailing whitespace
     package_spec = package_spec.strip()
 
-    # Define all possible version comparison operators
-    operators = ['==', '>=', '<=', '!=', '~=', '<', '>']
-
-    # Iterate through operators, split the string if found, and take the part before the operator as the package name
-    for op in operators:
-        if op in package_spec:
-            return package_spec.split(op)[0].strip()
+    # The package name is everything before the first version operator
+    if not _OP_CHARS.isdisjoint(package_spec):
+        return package_spec[:_OP_RE.search(package_spec).start()].strip()
 
     # If no version operator is found in the string, it's a pure package name; return as is
     return package_spec
 
 
+@lru_cache(maxsize=512)
+def _spec_set(specifiers):
+    """
+    Return the (shared) SpecifierSet for a constraint string such as ">=1.0,<2"
+
+    Building a SpecifierSet runs a regex per clause; equal constraints reuse one object.
+    Callers must not modify the returned set.
+    """
+    return packaging.specifiers.SpecifierSet(specifiers)
+
+
+@lru_cache(maxsize=1024)
 def _parse_requirement_spec(package_spec):
     """
     Parse package specification string using the packaging.requirements library
@@ -61,42 +108,158 @@ def _parse_requirement_spec(package_spec):
         This is an internal helper function that uses the packaging library for more accurate parsing
     """
     package_spec = package_spec.strip()
+
+    # A bare name has nothing for the PEP 508 parser to do
+    if _SPEC_CHARS.isdisjoint(package_spec):
+        return package_spec, _spec_set("")
+
     try:
         # Use packaging.requirements.Requirement for standard parsing
         req = packaging.requirements.Requirement(package_spec)
-        # Return package name and version constraints
-        return req.name, req.specifier
+        # Return package name and version constraints, shared with every spec using the same ones
+        return req.name, _spec_set(str(req.specifier))
     except Exception:
         # Fall back to simple parsing if standard parsing fails
         # Return package name and an unconstrained version specifier
-        return parse_package_name(package_spec), packaging.specifiers.SpecifierSet()
+        return parse_package_name(package_spec), _spec_set("")
 
 
-def _get_installed_version(package_name):
+def _dist_name_version(dist):
     """
-    Get the version of a package installed in the current environment
+    Read the canonical name and parsed version of an installed distribution
 
-    Parameters:
-        package_name (str): Package name
+    Returns:
+        tuple: (canonical name, packaging.version.Version), or None for broken installations
+
+    Note:
+        Wheel installs record both in the "<name>-<version>.dist-info" folder name, which
+        is used when possible; parsing METADATA is by far the slowest part of a scan
+    """
+    path = getattr(dist, '_path', None)
+    folder = getattr(path, 'name', '')
+    if folder.endswith('.dist-info'):
+        name, sep, version = folder[:-len('.dist-info')].partition('-')
+        if sep and name and '-' not in version:
+            try:
+                return _canonical_name(name), packaging.version.Version(version)
+            except packaging.version.InvalidVersion:
+                pass
+
+    name = dist.metadata['Name']
+    if not name:
+        # Broken or partially removed installation without metadata
+        return None
+    try:
+        version = packaging.version.parse(dist.version)
+    except packaging.version.InvalidVersion:
+        return None
+    return _canonical_name(name), version
+
+
+class _LazyInstalledMap:
+    """
+    Canonical package name -> installed version, read from the environment only as far as needed
+
+    get() walks importlib.metadata.distributions() until the requested name turns up and
+    remembers everything seen on the way; the scan resumes where it stopped on the next
+    miss, so a few requirements that are all installed cost far less than a full scan.
+    Only names that are not installed at all walk to the end (once).
+    """
+
+    def __init__(self):
+        self._versions = {}
+        self._dists = iter(importlib.metadata.distributions())
+        self._lock = threading.Lock()
+
+    def get(self, name, default=None):
+        version = self._versions.get(name)
+        if version is not None or self._dists is None:
+            return default if version is None else version
+        with self._lock:
+            version = self._versions.get(name)
+            while version is None and self._dists is not None:
+                dist = next(self._dists, None)
+                if dist is None:
+                    # Whole environment seen
+                    self._dists = None
+                    break
+                entry = _dist_name_version(dist)
+                if entry:
+                    # Like importlib.metadata.distribution, the first one on sys.path wins
+                    self._versions.setdefault(*entry)
+                    if entry[0] == name:
+                        version = self._versions[name]
+        return default if version is None else version
+
+
+def _get_installed_map():
+    """
+    Return the installed-package map, creating it on first use
 
     Returns:
-        packaging.version.Version: Version object of the installed package
+        _LazyInstalledMap: Canonical name -> packaging.version.Version via get() (shared)
+    """
+    global _INSTALLED_MAP
+    installed_map = _INSTALLED_MAP
+    if installed_map is None:
+        with _INSTALLED_MAP_LOCK:
+            if _INSTALLED_MAP is None:
+                _INSTALLED_MAP = _LazyInstalledMap()
+            installed_map = _INSTALLED_MAP
+    return installed_map
 
-    Exceptions:
-        importlib.metadata.PackageNotFoundError: If the package is not installed
+
+def invalidate_cache():
     """
-    # Get package distribution information via importlib.metadata
-    dist = importlib.metadata.distribution(package_name)
-    # Parse version string into a Version object for easy comparison
-    return packaging.version.parse(dist.version)
+    Forget the cached view of the environment
+
+    Call this after installing or removing packages outside install_requirements,
+    so the next check scans the environment again; install_requirements does it after
+    every installer run, since pip may also upgrade or downgrade dependencies
+    """
+    global _INSTALLED_MAP
+    # The import system caches directory listings, drop them so new metadata is found
+    importlib.invalidate_caches()
+    with _INSTALLED_MAP_LOCK:
+        _INSTALLED_MAP = None
 
 
-def check_package_installed(package_spec):
+def _check_installed_from_map(package_spec, installed_map):
+    """
+    Check a package specification against an installed-package map (see _get_installed_map)
+
+    Parameters:
+        package_spec (str): Package specification string, which may include version constraints
+        installed_map (dict): Canonical package name -> installed version (anything with get())
+
+    Returns:
+        bool: True if the package is installed and meets version requirements
+    """
+    # Parse package specification to get package name and version constraints
+    package_name, specifier = _parse_requirement_spec(package_spec)
+
+    # Map keys are canonical names, so this is a single dict lookup
+    installed_version = installed_map.get(_canonical_name(package_name))
+    if installed_version is None:
+        # Package not installed
+        return False
+
+    # If no version constraints, consider it passed as long as the package exists
+    if not specifier:
+        return True
+
+    # Use SpecifierSet to check if installed version satisfies constraints
+    return installed_version in specifier
+
+
+def check_package_installed(package_spec, installed_map=None):
     """
     Check if the specified package is installed and meets version requirements
 
     Parameters:
         package_spec (str): Package specification string, which may include version constraints
+        installed_map (dict): Optional canonical name -> installed version map (anything with
+                              get()); defaults to the cached map from _get_installed_map
 
     Returns:
         bool: True if the package is installed and meets version requirements,
@@ -107,23 +270,10 @@ def check_package_installed(package_spec):
         affect the main program flow
     """
     try:
-        # Parse package specification to get package name and version constraints
-        package_name, specifier = _parse_requirement_spec(package_spec)
-
-        # Get installed package version
-        installed_version = _get_installed_version(package_name)
-
-        # If no version constraints, consider it passed as long as the package exists
-        if not specifier:
-            return True
-
-        # Use SpecifierSet to check if installed version satisfies constraints
-        # Syntax: version in specifier
-        return installed_version in specifier
+        if installed_map is None:
+            installed_map = _get_installed_map()
+        return _check_installed_from_map(package_spec, installed_map)
 
-    except importlib.metadata.PackageNotFoundError:
-        # Package not installed
-        return False
     except Exception as e:
         # Catch all other exceptions, log but don't affect main flow
         print(f"Error checking package {package_spec}: {e}")
@@ -143,52 +293,50 @@ def parse_requirements(requirements_path):
     Note:
         Skips comments, blank lines, -e installations, git repository links,
         index URLs, and other special lines
+        The result is cached until the file's modification time changes
     """
     # Check if file exists
-    if not os.path.exists(requirements_path):
+    try:
+        mtime_ns = os.stat(requirements_path).st_mtime_ns
+    except OSError:
         return []
 
-    packages = []
-    with open(requirements_path, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-
-            # Skip empty lines
-            if not line:
-                continue
+    return _read_requirements(requirements_path, mtime_ns)
 
-            # Skip comment lines
-            if line.startswith('#'):
-                continue
 
-            # Skip editable installations (-e)
-            if line.startswith('-e'):
-                continue
-
-            # Skip direct git repository installations
-            if line.startswith('git+'):
-                continue
+def _read_requirements(requirements_path, mtime_ns):
+    """
+    Read and filter a requirements file whose modification time is already known
 
-            # Skip custom index URLs
-            if line.startswith('-i') or line.startswith('--index-url'):
-                continue
+    Parameters:
+        requirements_path (str): Path to the requirements.txt file
+        mtime_ns (int): The file's st_mtime_ns, used as the cache key
 
-            # Skip local file paths
-            if line.startswith('-f') or line.startswith('--find-links'):
-                continue
+    Returns:
+        list: List of package specification strings
+    """
+    key = (requirements_path, mtime_ns)
+    packages = _REQ_CACHE.get(key)
+    if packages is None:
+        with open(requirements_path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
 
-            # If it's a valid package specification, add to list
-            packages.append(line)
+        # Keep valid package specifications only: skip empty lines, comments, editable
+        # installations (-e), git repository links, custom index URLs and local file paths
+        packages = [line for line in map(str.strip, lines) if line and not _SKIP_RE.match(line)]
+        _REQ_CACHE[key] = packages
 
-    return packages
+    # Callers get their own list so the cached one can't be changed behind our back
+    return list(packages)
 
 
-def _filter_packages_by_install_status(all_packages, quiet=False):
+def _filter_packages_by_install_status(parsed_packages, quiet=False):
     """
     Separate already installed packages from packages to install based on current environment
 
     Parameters:
-        all_packages (list): List of all package specifications to check
+        parsed_packages (list): (package specification, package name, version constraint) tuples,
+                                as produced once by install_requirements
         quiet (bool): Whether to run in silent mode (no information output)
 
     Returns:
@@ -197,9 +345,13 @@ def _filter_packages_by_install_status(all_packages, quiet=False):
     installed_packages = []
     packages_to_install = []
 
-    for package in all_packages:
-        # Check if package is already installed
-        if check_package_installed(package):
+    # Scanned at most once, then shared by every check
+    installed_map = _get_installed_map()
+
+    for package, package_name, specifier in parsed_packages:
+        # Check if package is already installed and meets the version constraints
+        installed_version = installed_map.get(_canonical_name(package_name))
+        if installed_version is not None and (not specifier or installed_version in specifier):
             installed_packages.append(package)
             if not quiet:
                 print(f"✓ Already installed: {package}")
@@ -219,6 +371,23 @@ def _build_install_command(package, use_conda=False, conda_env_name=None, upgrad
         conda_env_name (str): Conda environment name; None means current environment
         upgrade (bool): Whether to upgrade already installed packages
 
+    Returns:
+        list: Command line argument list
+    """
+    return _build_install_command_batch([package], use_conda=use_conda,
+                                        conda_env_name=conda_env_name, upgrade=upgrade)
+
+
+def _build_install_command_batch(packages, use_conda=False, conda_env_name=None, upgrade=False):
+    """
+    Build one installation command (pip or conda) covering several packages
+
+    Parameters:
+        packages (list): Package specifications to install
+        use_conda (bool): Whether to use conda for installation
+        conda_env_name (str): Conda environment name; None means current environment
+        upgrade (bool): Whether to upgrade already installed packages
+
     Returns:
         list: Command line argument list
     """
@@ -231,22 +400,69 @@ def _build_install_command(package, use_conda=False, conda_env_name=None, upgrad
             # Current conda environment
             cmd = ["conda", "install", "-y"]
 
-        # Conda handles version constraints slightly differently than pip
-        if '==' in package:
-            pkg_name, pkg_version = package.split('==', 1)
-            cmd.append(f"{pkg_name}={pkg_version}")
-        else:
-            cmd.append(package)
+        for package in packages:
+            # Conda handles version constraints slightly differently than pip
+            if '==' in package:
+                pkg_name, pkg_version = package.split('==', 1)
+                cmd.append(f"{pkg_name}={pkg_version}")
+            else:
+                cmd.append(package)
     else:
         # Build pip installation command
         cmd = [sys.executable, "-m", "pip", "install"]
         if upgrade:
             cmd.append("--upgrade")
-        cmd.append(package)
+        cmd.extend(packages)
 
     return cmd
 
 
+def _run_install_command(cmd, timeout):
+    """
+    Run an installation command, keeping only the end of its error output
+
+    Parameters:
+        cmd (list): Command line argument list
+        timeout (int): Seconds before the installer is killed
+
+    Returns:
+        tuple: (return code, last lines of stderr as a string)
+
+    Exceptions:
+        subprocess.TimeoutExpired: If the installer ran longer than timeout
+
+    Note:
+        stdout (download / progress output) is discarded and stderr is read line by line
+        into a bounded deque, so memory stays flat however much the installer prints
+    """
+
+    process = subprocess.Popen(
+        cmd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors='replace'
+    )
+    timed_out = threading.Event()
+
+    def kill():
+        timed_out.set()
+        process.kill()
+
+    timer = threading.Timer(timeout, kill)
+    timer.start()
+    try:
+        with process.stderr:
+            tail = deque(process.stderr, maxlen=_STDERR_TAIL_LINES)
+        returncode = process.wait()
+    finally:
+        timer.cancel()
+
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    return returncode, "".join(tail)
+
+
 def _install_single_package(package, use_conda=False, conda_env_name=None, upgrade=False, quiet=False):
     """
     Install a single package
@@ -270,28 +486,22 @@ def _install_single_package(package, use_conda=False, conda_env_name=None, upgra
                                  upgrade=upgrade)
 
     try:
-        # Execute installation command
-        result = subprocess.run(
-            cmd,
-            capture_output=True,  # Capture stdout and stderr
-            text=True,            # Process output as text
-            timeout=300,          # 5-minute timeout
-            check=False           # Don't automatically raise exceptions
-        )
-
-        if result.returncode == 0:
+        # Execute installation command with a 5-minute timeout
+        returncode, stderr = _run_install_command(cmd, timeout=300)
+
+        if returncode == 0:
             # Installation successful
             if not quiet:
                 print(f"  ✓ Successfully installed: {package}")
             return True, None
 
         # Installation failed, extract error message
-        error_msg = result.stderr.strip() or "Unknown error"
+        error_msg = stderr.strip() or "Unknown error"
         if not quiet:
             print(f"  ✗ Failed to install: {package}")
-            if result.stderr:
+            if stderr:
                 # Show only first 200 characters of error message
-                print(f"    Error: {result.stderr[:200]}")
+                print(f"    Error: {stderr[:200]}")
         return False, error_msg
 
     except subprocess.TimeoutExpired:
@@ -307,8 +517,113 @@ def _install_single_package(package, use_conda=False, conda_env_name=None, upgra
         return False, str(e)
 
 
+async def _install_single_package_async(package, semaphore, upgrade=False):
+    """
+    Install a single package with pip without blocking the event loop
+
+    Parameters:
+        package (str): Package specification to install
+        semaphore (asyncio.Semaphore): Limits how many installers run at once
+        upgrade (bool): Whether to upgrade
+
+    Returns:
+        tuple: (installation success status, error message or None)
+    """
+    cmd = _build_install_command(package, upgrade=upgrade)
+
+    async with semaphore:
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE
+            )
+        except Exception as e:
+            return False, str(e)
+
+        # Keep only the end of stderr, that's where pip reports what went wrong
+        tail = deque(maxlen=_STDERR_TAIL_LINES)
+
+        async def drain():
+            async for line in process.stderr:
+                tail.append(line.decode('utf-8', errors='replace'))
+            return await process.wait()
+
+        try:
+            returncode = await asyncio.wait_for(drain(), timeout=300)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            return False, "Installation timeout (5 minutes)"
+
+    if returncode == 0:
+        return True, None
+    return False, "".join(tail).strip() or "Unknown error"
+
+
+def _event_loop_running():
+    """Whether this thread is inside a running event loop, where asyncio.run cannot be used"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+async def _install_packages_concurrently(packages, upgrade=False):
+    """
+    Install packages with pip side by side, at most MAX_INSTALL_WORKERS at a time
+
+    Returns:
+        list: (installation success status, error message or None) per package, in input order
+    """
+    semaphore = asyncio.Semaphore(MAX_INSTALL_WORKERS)
+    return await asyncio.gather(*(
+        _install_single_package_async(package, semaphore, upgrade=upgrade) for package in packages
+    ))
+
+
+def _install_packages_batch(packages, use_conda=False, conda_env_name=None, upgrade=False, quiet=False):
+    """
+    Install several packages with a single pip / conda invocation
+
+    Parameters:
+        packages (list): Package specifications to install
+        use_conda (bool): Whether to use conda
+        conda_env_name (str): Conda environment name
+        upgrade (bool): Whether to upgrade
+        quiet (bool): Whether to run in silent mode
+
+    Returns:
+        bool: True if every package was installed; on failure nothing tells which
+              package was at fault, so the caller falls back to per-package installs
+    """
+    if not quiet:
+        print(f"Installing together: {', '.join(packages)}")
+
+    cmd = _build_install_command_batch(packages, use_conda=use_conda,
+                                       conda_env_name=conda_env_name,
+                                       upgrade=upgrade)
+
+    try:
+        # Same time budget as installing one by one
+        returncode, _ = _run_install_command(cmd, timeout=300 * len(packages))
+    except Exception:
+        return False
+
+    if returncode == 0:
+        if not quiet:
+            for package in packages:
+                print(f"  ✓ Successfully installed: {package}")
+        return True
+
+    if not quiet:
+        print("  Combined installation failed, installing packages one by one")
+    return False
+
+
 def install_requirements(requirements_path, use_conda=False, conda_env_name=None, upgrade=False, quiet=False,
-                         auto_install=True):
+                         auto_install=True, parallel=False):
     """
     Install dependencies from requirements.txt, supports automatic installation judgment
 
@@ -320,6 +635,10 @@ def install_requirements(requirements_path, use_conda=False, conda_env_name=None
         quiet (bool): Whether to run in silent mode
         auto_install (bool): Whether to automatically install dependencies;
                              if False, skip installation step
+        parallel (bool): Whether the one-by-one fallback runs pip installations concurrently.
+                         Off by default: concurrent pip processes writing the same site-packages
+                         can race on shared dependencies. Conda installs, and calls made from
+                         inside a running event loop, always install one at a time
 
     Returns:
         dict: Dictionary containing installation results with the following keys:
@@ -335,8 +654,12 @@ def install_requirements(requirements_path, use_conda=False, conda_env_name=None
     Exceptions:
         Does not raise exceptions; all errors are passed through return value
     """
-    # 1. Automatic installation condition check
-    if not (auto_install and requirements_path and os.path.exists(requirements_path)):
+    # 1. Automatic installation condition check (a single stat tells whether the file exists)
+    if not (auto_install and requirements_path):
+        return None
+    try:
+        mtime_ns = os.stat(requirements_path).st_mtime_ns
+    except OSError:
         return None
 
     # 2. Display installation step information
@@ -350,20 +673,20 @@ def install_requirements(requirements_path, use_conda=False, conda_env_name=None
         else:
             print("Using pip installation (current Python environment)")
 
-    # 3. Check if requirements file exists
-    if not os.path.exists(requirements_path):
-        result = {
-            "success": False,
-            "error": f"requirements.txt file does not exist: {requirements_path}",
-            "installed": [],
-            "failed": []
-        }
-        if not quiet:
-            print(f"✗ Dependency installation failed: {result['error']}")
-        return result
+    # Unchanged file, same environment and everything still installed: nothing to do.
+    # An upgrade always goes to the installer, so it never takes the shortcut.
+    result_key = (requirements_path, mtime_ns, sys.prefix, use_conda, conda_env_name)
+    cached_result = None if upgrade else _RESULT_CACHE.get(result_key)
+    if cached_result is not None:
+        installed_map = _get_installed_map()
+        if all(check_package_installed(package, installed_map) for package in cached_result["installed"]):
+            if not quiet:
+                print(f"✓ Dependency installation completed: {cached_result['message']}")
+            return dict(cached_result)
+        del _RESULT_CACHE[result_key]
 
-    # 4. Parse requirements file
-    all_packages = parse_requirements(requirements_path)
+    # 3. Parse requirements file
+    all_packages = _read_requirements(requirements_path, mtime_ns)
     if not all_packages:
         result = {
             "success": True,
@@ -375,13 +698,14 @@ def install_requirements(requirements_path, use_conda=False, conda_env_name=None
             print(f"✓ Dependency installation completed: {result['message']}")
         return result
 
-    # 5. Separate already installed packages from those to install
+    # 4. Parse every specification once, then separate already installed packages from those to install
+    parsed_packages = [(package, *_parse_requirement_spec(package)) for package in all_packages]
     installed_packages, packages_to_install = _filter_packages_by_install_status(
-        all_packages,
+        parsed_packages,
         quiet=quiet
     )
 
-    # 6. If all packages are already installed, return success immediately
+    # 5. If all packages are already installed, return success immediately
     if not packages_to_install:
         result = {
             "success": True,
@@ -389,22 +713,49 @@ def install_requirements(requirements_path, use_conda=False, conda_env_name=None
             "installed": installed_packages,
             "failed": []
         }
+        _RESULT_CACHE[result_key] = result
         if not quiet:
             print(f"✓ Dependency installation completed: {result['message']}")
         return result
 
-    # 7. Install packages to install one by one
+    # 6. Install packages to install: all at once, falling back to one by one
+    #    (concurrently with pip when parallel is set) to find out which packages fail
     success_packages = []  # Packages successfully installed this time
     failed_packages = []  # Packages that failed installation this time
 
-    for package in packages_to_install:
-        ok, error = _install_single_package(
-            package,
+    if len(packages_to_install) > 1 and _install_packages_batch(
+            packages_to_install,
             use_conda=use_conda,
             conda_env_name=conda_env_name,
             upgrade=upgrade,
             quiet=quiet
-        )
+    ):
+        # One resolver run and one interpreter start-up for all packages
+        results = [(package, (True, None)) for package in packages_to_install]
+    elif parallel and not use_conda and len(packages_to_install) > 1 and not _event_loop_running():
+        if not quiet:
+            for package in packages_to_install:
+                print(f"Installing: {package}")
+        # Installs run silently side by side, results are reported here in requirements order
+        outcomes = asyncio.run(_install_packages_concurrently(packages_to_install, upgrade=upgrade))
+        results = list(zip(packages_to_install, outcomes))
+        if not quiet:
+            for package, (ok, error) in results:
+                if ok:
+                    print(f"  ✓ Successfully installed: {package}")
+                else:
+                    print(f"  ✗ Failed to install: {package}")
+                    print(f"    Error: {error[:200]}")
+    else:
+        results = [
+            (package, _install_single_package(package, use_conda=use_conda, conda_env_name=conda_env_name,
+                                              upgrade=upgrade, quiet=quiet))
+            for package in packages_to_install
+        ]
+
+    # Even a failed run may have changed dependencies, so every later check rescans the environment
+    invalidate_cache()
+    for package, (ok, error) in results:
         if ok:
             success_packages.append(package)
         else:
@@ -413,7 +764,7 @@ def install_requirements(requirements_path, use_conda=False, conda_env_name=None
                 "error": error
             })
 
-    # 8. Compile and return results
+    # 7. Compile and return results
     all_installed = installed_packages + success_packages
 
     if failed_packages:
@@ -439,7 +790,10 @@ def install_requirements(requirements_path, use_conda=False, conda_env_name=None
             "failure_count": 0
         }
 
-    # 9. Output final result
+    if result["success"]:
+        _RESULT_CACHE[result_key] = result
+
+    # 8. Output final result
     if not quiet:
         if result["success"]:
             print(f"✓ Dependency installation completed: {result['message']}")
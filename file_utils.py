@@ -3,9 +3,85 @@ File utility module
 """
 
 import os
+import re
 import json
+import tempfile
+import threading
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_TRACEBACK_FILE_RE = re.compile(r'File "([^"]+)", line \d+')
+
+_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+_READ_WORKERS = 8
+
+# get_directory_tree results, least recently used first:
+# (abspath, show_files, max_depth, return_as_string) -> (root mtime_ns, tree)
+_TREE_CACHE = OrderedDict()
+_TREE_CACHE_SIZE = 32
+_TREE_CACHE_LOCK = threading.Lock()
+
+
+def _loads_json(data):
+    """
+    Parse JSON text or bytes, using orjson when it is installed
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps_json_bytes(data):
+    """
+    Serialize to UTF-8 JSON bytes with 2-space indentation, using orjson when it is installed
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, ensure_ascii=False, indent=2, sort_keys=False).encode('utf-8')
+
+
+def dumps_json_compact(data):
+    """
+    Serialize to a compact JSON string (no indentation, non-ASCII kept), using orjson when it is installed
+    """
+    if orjson is not None:
+        return orjson.dumps(data).decode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def _atomic_write_bytes(path, data):
+    """
+    Write bytes to path through a temp file in the same directory, fsync it and rename it over path,
+    so readers never see a half-written file
+    """
+    dir_name = os.path.dirname(path) or '.'
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+    fd, tmp_path = tempfile.mkstemp(dir=dir_name, prefix='.' + os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+        os.close(fd)
+        fd = None
+        # mkstemp creates the file as 0600
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if fd is not None:
+            os.close(fd)
+        os.unlink(tmp_path)
+        raise
+
 
 def ensure_directory(dir_path):
     """
@@ -31,71 +107,63 @@ def save_project_json(project_data: Dict[str, Any], project_root: str) -> None:
     # Define JSON file path
     project_file = os.path.join(project_root, "project_detail.json")
 
-    # Create a copy of data without code fields for merging logic
-    data_for_merge = project_data.copy()
-
-    # Remove code field from each file in out_file
-    if "out_file" in data_for_merge:
-        for file_info in data_for_merge["out_file"]:
-            if "code" in file_info:
-                del file_info["code"]
+    # One pass over the new entries: keep operation for the merge logic, drop code.
+    # Fresh dicts are built so the caller's project data is left untouched.
+    merge_files = [
+        {key: file_info[key] for key in ("file_name", "description", "operation") if key in file_info}
+        for file_info in project_data.get("out_file", [])
+    ]
 
-    # Create a copy of data without code and operation fields for final saving
-    data_for_save = OrderedDict()
-
-    # Add top-level fields in specified order
+    # Data without code and operation fields for final saving, top-level fields in specified order
+    data_for_save = {}
     if "project_folder_name" in project_data:
         data_for_save["project_folder_name"] = project_data["project_folder_name"]
     if "project_type" in project_data:
         data_for_save["project_type"] = project_data["project_type"]
-
-    # Process out_file, removing code and operation fields
     if "out_file" in project_data:
-        # Process each file, arranging in specified order
-        processed_files = []
-
-        for file_info in project_data["out_file"]:
-            # Only keep file_name and description fields, arranged in specified order
-            processed_file = OrderedDict()
-            if "file_name" in file_info:
-                processed_file["file_name"] = file_info["file_name"]
-            if "description" in file_info:
-                processed_file["description"] = file_info["description"]
-
-            processed_files.append(processed_file)
-
-        data_for_save["out_file"] = processed_files
+        # Only keep file_name and description fields, arranged in specified order
+        data_for_save["out_file"] = [
+            {key: value for key, value in file_info.items() if key != "operation"}
+            for file_info in merge_files
+        ]
 
     # Check if JSON file already exists
+    existing_payload = None
     if os.path.exists(project_file):
         try:
             # Read existing JSON data
-            with open(project_file, 'r', encoding='utf-8') as f:
-                existing_data = json.load(f, object_pairs_hook=OrderedDict)
+            with open(project_file, 'rb') as f:
+                existing_payload = f.read()
+            existing_data = _loads_json(existing_payload)
 
-            # Merge data: Use data_for_merge (with operation field) for merging logic
-            if "out_file" in existing_data and "out_file" in data_for_merge:
+            # Merge data: Use merge_files (with operation field) for merging logic
+            if "out_file" in existing_data and "out_file" in project_data:
                 new_out_files = []
-                processed_files = set()
+
+                # Index new data by file name; the first entry for a name wins, as before.
+                # consumed[i] marks that the entry at index i matched an existing file.
+                merge_index = {}
+                for i, merge_file in enumerate(merge_files):
+                    merge_index.setdefault(merge_file["file_name"], i)
+                consumed = [False] * len(merge_files)
 
                 # First process existing files
                 for existing_file in existing_data["out_file"]:
                     file_name = existing_file["file_name"]
 
                     # Check if there is a corresponding file in new data
+                    match_index = merge_index.get(file_name)
                     matching_new_file = None
-                    for merge_file in data_for_merge["out_file"]:
-                        if merge_file["file_name"] == file_name:
-                            matching_new_file = merge_file
-                            processed_files.add(file_name)
-                            break
+                    if match_index is not None:
+                        consumed[match_index] = True
+                        matching_new_file = merge_files[match_index]
 
                     if matching_new_file:
                         if matching_new_file.get("operation") == "delete":
                             continue
                         else:
                             # Non-delete operation, create entry without operation
-                            updated_file = OrderedDict()
+                            updated_file = {}
                             updated_file["file_name"] = file_name
                             if "description" in matching_new_file:
                                 updated_file["description"] = matching_new_file["description"]
@@ -106,7 +174,7 @@ def save_project_json(project_data: Dict[str, Any], project_root: str) -> None:
                         # No corresponding new file, keep as is (without operation)
                         if "operation" in existing_file:
                             # If existing file contains operation field, remove it
-                            file_without_operation = OrderedDict()
+                            file_without_operation = {}
                             file_without_operation["file_name"] = existing_file["file_name"]
                             if "description" in existing_file:
                                 file_without_operation["description"] = existing_file["description"]
@@ -114,20 +182,20 @@ def save_project_json(project_data: Dict[str, Any], project_root: str) -> None:
                         else:
                             new_out_files.append(existing_file)
 
-                # Then process newly added files in new data (files not recorded in processed_files)
-                for merge_file in data_for_merge["out_file"]:
+                # Then process newly added files in new data (names not matched above)
+                for merge_file in merge_files:
                     file_name = merge_file["file_name"]
-                    if (file_name not in processed_files and
+                    if (not consumed[merge_index[file_name]] and
                             merge_file.get("operation") != "delete"):
                         # Newly added file and not a delete operation
-                        new_file = OrderedDict()
+                        new_file = {}
                         new_file["file_name"] = file_name
                         if "description" in merge_file:
                             new_file["description"] = merge_file["description"]
                         new_out_files.append(new_file)
 
                 # Create final merged data
-                merged_data = OrderedDict()
+                merged_data = {}
 
                 # Add fields in specified order
                 if "project_folder_name" in data_for_save:
@@ -151,15 +219,20 @@ def save_project_json(project_data: Dict[str, Any], project_root: str) -> None:
     else:
         data_to_save = data_for_save
 
+    # Entries kept as they were on disk are the only ones that may still carry these fields
     if "out_file" in data_to_save:
-        for file_info in data_to_save["out_file"]:
-            if "operation" in file_info:
-                del file_info["operation"]
-            if "code" in file_info:
-                del file_info["code"]
+        data_to_save["out_file"] = [
+            {key: value for key, value in file_info.items() if key not in ("operation", "code")}
+            for file_info in data_to_save["out_file"]
+        ]
 
-    with open(project_file, 'w', encoding='utf-8') as f:
-        json.dump(data_to_save, f, ensure_ascii=False, indent=2, sort_keys=False)
+    # Serialize first and write once; json.dump issues a write per token
+    payload = _dumps_json_bytes(data_to_save)
+    # Nothing changed on disk: skip the rewrite
+    if payload == existing_payload:
+        return
+    _atomic_write_bytes(project_file, payload)
+    invalidate_directory_tree(project_file)
 
 
 # Helper function: Create data containing operation field for merging logic
@@ -177,26 +250,27 @@ def create_project_data(project_folder_name: str,
     Returns:
         Dictionary containing complete data
     """
-    data = OrderedDict()
-    data["project_folder_name"] = project_folder_name
-    data["project_type"] = project_type
-
-    ordered_files = []
-    for file_info in out_files:
-        ordered_file = OrderedDict()
-        ordered_file["file_name"] = file_info.get("file_name", "")
-        ordered_file["operation"] = file_info.get("operation", "")
-        ordered_file["description"] = file_info.get("description", "")
-        ordered_files.append(ordered_file)
-
-    data["out_file"] = ordered_files
-    return data
+    # Plain dicts keep insertion order, which fixes the key order in the saved JSON
+    ordered_files = [
+        {
+            "file_name": file_info.get("file_name", ""),
+            "operation": file_info.get("operation", ""),
+            "description": file_info.get("description", ""),
+        }
+        for file_info in out_files
+    ]
+
+    return {
+        "project_folder_name": project_folder_name,
+        "project_type": project_type,
+        "out_file": ordered_files,
+    }
 
 
 def get_directory_tree_str(root_dir, indent='', is_last=True, show_files=True, max_depth=None, current_depth=0,
                            output_lines=None):
     """
-    Recursively generate a string representation of a directory tree
+    Generate a string representation of a directory tree
 
     Args:
         root_dir: Root directory path
@@ -213,38 +287,50 @@ def get_directory_tree_str(root_dir, indent='', is_last=True, show_files=True, m
     if output_lines is None:
         output_lines = []
 
-    if max_depth is not None and current_depth > max_depth:
-        return output_lines
+    # Explicit stack instead of recursion: holds finished lines (str) and directories
+    # still to expand (tuple), popped in output order
+    stack = [(root_dir, indent, is_last, current_depth)]
 
-    # Get all items in directory and sort them
-    items = []
-    try:
-        items = sorted(os.listdir(root_dir))
-    except (PermissionError, OSError):
-        output_lines.append(f"{indent}└── [权限不足，无法访问]")
-        return output_lines
-
-    # Separate files and folders
-    dirs = []
-    files = []
-    for item in items:
-        item_path = os.path.join(root_dir, item)
-        if os.path.isdir(item_path):
-            dirs.append(item)
-        else:
-            files.append(item)
+    while stack:
+        task = stack.pop()
+        if isinstance(task, str):
+            output_lines.append(task)
+            continue
+
+        dir_path, indent, is_last, depth = task
+        if max_depth is not None and depth > max_depth:
+            continue
 
-    # Combine lists: directories first, then files
-    all_items = dirs + files if show_files else dirs
+        # Get all entries in directory and sort them; DirEntry caches the type and stat
+        # information, so each entry costs one syscall instead of listdir + isdir + getsize
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except (PermissionError, OSError):
+            output_lines.append(f"{indent}└── [权限不足，无法访问]")
+            continue
+
+        # Separate files and folders
+        dirs = []
+        files = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                dirs.append(entry)
+            else:
+                files.append(entry)
 
-    # Calculate total items
-    total_items = len(all_items)
+        # Combine lists: directories first, then files
+        all_items = dirs + files if show_files else dirs
 
-    for i, item in enumerate(all_items):
-        item_path = os.path.join(root_dir, item)
-        is_item_last = (i == total_items - 1)
+        # Calculate total items
+        total_items = len(all_items)
+        dir_count = len(dirs)
 
-        # Determine connector for current item
+        # Determine connector for the items of this directory
         if is_last:
             connector = '└── '
             next_indent = indent + '    '
@@ -252,28 +338,32 @@ def get_directory_tree_str(root_dir, indent='', is_last=True, show_files=True, m
             connector = '├── '
             next_indent = indent + '│   '
 
-        # Process current item
-        if os.path.isdir(item_path):
-            output_lines.append(f"{indent}{connector}{item}/")
-            # Recursively process subdirectory
-            get_directory_tree_str(item_path, next_indent, is_item_last,
-                                   show_files, max_depth, current_depth + 1, output_lines)
-        elif show_files:
-            # Get file size
-            try:
-                size = os.path.getsize(item_path)
-                # Convert to appropriate unit with 2 decimal places
-                for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-                    if size < 1024.0 or unit == 'TB':
-                        if unit == 'B':
-                            size_str = f"{size} B"
-                        else:
-                            size_str = f"{size:.2f} {unit}"
-                        break
-                    size /= 1024.0
-                output_lines.append(f"{indent}{connector}{item} ({size_str})")
-            except (PermissionError, OSError):
-                output_lines.append(f"{indent}{connector}{item} [无法获取大小]")
+        pending = []
+        for i, entry in enumerate(all_items):
+            item = entry.name
+            is_item_last = (i == total_items - 1)
+
+            # Process current item
+            if i < dir_count:
+                pending.append(f"{indent}{connector}{item}/")
+                # Subdirectory contents follow right after its own line
+                pending.append((entry.path, next_indent, is_item_last, depth + 1))
+            elif show_files:
+                # Get file size
+                try:
+                    size = entry.stat().st_size
+                    # Convert to appropriate unit with 2 decimal places
+                    if size < 1024:
+                        size_str = f"{size} B"
+                    else:
+                        # Each unit is 2**10 of the previous one, so the bit length picks it
+                        idx = min((size.bit_length() - 1) // 10, len(_UNITS) - 1)
+                        size_str = f"{size / (1 << (idx * 10)):.2f} {_UNITS[idx]}"
+                    pending.append(f"{indent}{connector}{item} ({size_str})")
+                except (PermissionError, OSError):
+                    pending.append(f"{indent}{connector}{item} [无法获取大小]")
+
+        stack.extend(reversed(pending))
 
     return output_lines
 
@@ -297,82 +387,232 @@ def get_directory_tree(folder_path, show_files=True, max_depth=None, return_as_s
     if not os.path.isdir(folder_path):
         return f"Error: '{folder_path}' is not a folder"
 
+    # Reuse the last walk while the root folder's entries are unchanged (a single stat) and nothing
+    # was written through this module or project_generator (see invalidate_directory_tree).
+    # Files edited in place by other programs are only picked up once something invalidates the entry.
+    key = (os.path.abspath(folder_path), show_files, max_depth, return_as_string)
+    stamp = os.stat(folder_path).st_mtime_ns
+    with _TREE_CACHE_LOCK:
+        cached = _TREE_CACHE.get(key)
+        if cached is not None and cached[0] == stamp:
+            _TREE_CACHE.move_to_end(key)
+            return cached[1] if return_as_string else list(cached[1])
+
     # Build directory tree
     output_lines = [f"{os.path.basename(folder_path)}/"]
     output_lines.extend(get_directory_tree_str(folder_path, '', True, show_files, max_depth, 0, []))
 
-    if return_as_string:
-        return "\n".join(output_lines)
-    else:
-        return output_lines
+    result = "\n".join(output_lines) if return_as_string else output_lines
+    with _TREE_CACHE_LOCK:
+        _TREE_CACHE[key] = (stamp, result)
+        _TREE_CACHE.move_to_end(key)
+        if len(_TREE_CACHE) > _TREE_CACHE_SIZE:
+            _TREE_CACHE.popitem(last=False)
+    return result if return_as_string else list(result)
 
 
-def process_json_request(json_request, actual_project_root):
+def invalidate_directory_tree(path=None):
+    """
+    Forget cached directory trees that include path (a changed file or folder), or all of them
+    """
+    with _TREE_CACHE_LOCK:
+        if path is None:
+            _TREE_CACHE.clear()
+            return
+        path = os.path.abspath(path)
+        for key in list(_TREE_CACHE):
+            try:
+                common = os.path.commonpath([key[0], path])
+            except ValueError:
+                continue
+            if common in (key[0], path):
+                del _TREE_CACHE[key]
+
+
+def _read_text(file_path):
+    """
+    Read a UTF-8 file with raw os.read calls sized from fstat. Reading stops once st_size bytes
+    have arrived, so a regular file usually takes a single read; files reporting size 0
+    (e.g. under /proc) are read until EOF.
+    """
+    fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        size = os.fstat(fd).st_size
+        chunks = []
+        received = 0
+        while not size or received < size:
+            chunk = os.read(fd, max(size - received, 1 << 16))
+            if not chunk:
+                break
+            chunks.append(chunk)
+            received += len(chunk)
+    finally:
+        os.close(fd)
+    data = chunks[0] if len(chunks) == 1 else b''.join(chunks)
+    text = data.decode('utf-8')
+    # Same newline translation text-mode open() would have done
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def _safe_read(file_name, file_path):
+    """
+    Read one requested file, turning failures into a placeholder comment
+
+    Returns:
+        (code, log message) tuple
+    """
+    try:
+        return _read_text(file_path), f"Successfully read: {file_name}"
+    except FileNotFoundError:
+        return (f"# Error: File '{file_name}' not found at {file_path}",
+                f"Error: File not found: {file_path}")
+    except PermissionError:
+        return (f"# Error: Permission denied for file '{file_name}'",
+                f"Error: Permission denied: {file_path}")
+    except Exception as e:
+        return f"# Error reading file: {str(e)}", f"Error reading {file_path}: {str(e)}"
+
+
+class ReadPrefetcher:
+    """
+    on_item callback for the streamed model reply: every "read" entry starts reading its file on
+    a thread right away, while the rest of the reply is still arriving. Pass the prefetcher to
+    process_json_request afterwards to pick up the results.
+    """
+
+    def __init__(self, project_root):
+        self.project_root = os.path.abspath(project_root) if project_root else None
+        self.futures = {}
+        self._executor = None
+
+    def __call__(self, item):
+        if self.project_root is None or not isinstance(item, dict) or item.get("operation") != "read":
+            return
+        file_name = item.get("file_name")
+        if not file_name:
+            return
+        file_path = os.path.join(self.project_root, file_name)
+        if file_path in self.futures:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=_READ_WORKERS)
+        self.futures[file_path] = self._executor.submit(_safe_read, file_name, file_path)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+
+def process_json_request(json_request, actual_project_root, prefetched=None):
     """
     Process JSON request, read files with operation "read"
 
     Args:
         json_request: JSON dictionary containing file operation information
         actual_project_root: Actual path of project root directory
+        prefetched: Optional ReadPrefetcher whose finished reads are used instead of reading again
 
     Returns:
         JSON dictionary containing read file contents
     """
     try:
         if isinstance(json_request, str):
-            request_data = json.loads(json_request)
+            request_data = _loads_json(json_request)
         else:
             request_data = json_request
 
-        corresponding_code = []
-
         if "out_file" not in request_data:
             return {"error": "Missing 'out_file' field in request"}
 
+        read_paths = []
+        project_root = os.path.abspath(actual_project_root)
         for file_request in request_data["out_file"]:
             if "file_name" not in file_request or "operation" not in file_request:
                 print(f"Warning: Skipping file request with missing fields: {file_request}")
                 continue
 
-            file_name = file_request["file_name"]
-            operation = file_request["operation"]
+            if file_request["operation"] == "read":
+                file_name = file_request["file_name"]
+                read_paths.append((file_name, os.path.join(project_root, file_name)))
+
+        futures = prefetched.futures if prefetched is not None else {}
+        results = [None] * len(read_paths)
+        missing = []
+        for i, (file_name, file_path) in enumerate(read_paths):
+            future = futures.get(file_path)
+            if future is not None:
+                results[i] = future.result()
+            else:
+                missing.append(i)
 
-            if operation == "read":
-                file_path = os.path.join(os.path.abspath(actual_project_root), file_name)
+        # Reads release the GIL, so several files are fetched from disk at once
+        if len(missing) > 1:
+            with ThreadPoolExecutor(max_workers=min(_READ_WORKERS, len(missing))) as executor:
+                for i, result in zip(missing, executor.map(lambda i: _safe_read(*read_paths[i]), missing)):
+                    results[i] = result
+        else:
+            for i in missing:
+                results[i] = _safe_read(*read_paths[i])
 
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as file:
-                        file_content = file.read()
-
-                    corresponding_code.append({
-                        "file_name": file_name,
-                        "code": file_content
-                    })
-
-                    print(f"Successfully read: {file_name}")
-
-                except FileNotFoundError:
-                    print(f"Error: File not found: {file_path}")
-                    corresponding_code.append({
-                        "file_name": file_name,
-                        "code": f"# Error: File '{file_name}' not found at {file_path}"
-                    })
-                except PermissionError:
-                    print(f"Error: Permission denied: {file_path}")
-                    corresponding_code.append({
-                        "file_name": file_name,
-                        "code": f"# Error: Permission denied for file '{file_name}'"
-                    })
-                except Exception as e:
-                    print(f"Error reading {file_path}: {str(e)}")
-                    corresponding_code.append({
-                        "file_name": file_name,
-                        "code": f"# Error reading file: {str(e)}"
-                    })
+        corresponding_code = []
+        for (file_name, _), (code, message) in zip(read_paths, results):
+            print(message)
+            corresponding_code.append({
+                "file_name": file_name,
+                "code": code
+            })
 
         return {"corresponding_code": corresponding_code}
 
     except json.JSONDecodeError as e:
         return {"error": f"Invalid JSON: {str(e)}"}
     except Exception as e:
-        return {"error": f"Unexpected error: {str(e)}"}
\ No newline at end of file
+        return {"error": f"Unexpected error: {str(e)}"}
+
+
+def collect_traceback_files(error_message, project_root):
+    """
+    Read the project files referenced by a traceback, so they can travel with the error report
+
+    Args:
+        error_message: Error output that may contain a Python traceback
+        project_root: Directory holding the project folder; files outside it are ignored
+
+    Returns:
+        List of {"file_name", "code"} dictionaries, file_name relative to the project folder
+    """
+    if not error_message or not project_root:
+        return []
+
+    root = os.path.abspath(project_root)
+    project_folder = None
+    read_requests = []
+
+    for path in _TRACEBACK_FILE_RE.findall(error_message):
+        path = os.path.abspath(path)
+        try:
+            if os.path.commonpath([root, path]) != root:
+                continue
+        except ValueError:
+            # Different drives on Windows
+            continue
+        if not os.path.isfile(path):
+            continue
+
+        # The first path component below project_root is the project folder itself
+        parts = os.path.relpath(path, root).split(os.sep, 1)
+        if len(parts) != 2:
+            continue
+        folder, file_name = parts
+        project_folder = project_folder or folder
+        file_name = file_name.replace(os.sep, "/")
+        if folder != project_folder or any(r["file_name"] == file_name for r in read_requests):
+            continue
+        read_requests.append({"file_name": file_name, "operation": "read"})
+
+    if not read_requests:
+        return []
+    result = process_json_request({"out_file": read_requests}, os.path.join(root, project_folder))
+    return result.get("corresponding_code", [])
@@ -1,7 +1,16 @@
 from flask import Flask, render_template, request
 import arxiv_fetcher
 
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
 app = Flask(__name__)
+# Templates are only loaded once; no stat of every template file on each render
+app.config['TEMPLATES_AUTO_RELOAD'] = False
+if Compress is not None:
+    Compress(app)
 
 @app.route('/')
 def index():
@@ -22,4 +31,9 @@ def paper_detail(paper_id):
     return render_template('detail.html', paper=paper, citations=citations)
 
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    try:
+        from waitress import serve
+    except ImportError:
+        app.run(host='127.0.0.1', port=5000, threaded=True)
+    else:
+        serve(app, host='127.0.0.1', port=5000, threads=8)
\ No newline at end of file
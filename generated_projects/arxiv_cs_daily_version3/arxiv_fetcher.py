@@ -1,18 +1,154 @@
+import functools
+import io
+import json
+import os
+import tempfile
+import threading
+import time
 import requests
-import xml.etree.ElementTree as ET
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as _StreamError
+
+# libxml2-backed lxml parses the Atom feeds much faster; the stdlib parser has the same API here
+try:
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _USE_LXML = False
+else:
+    _USE_LXML = True
+
+# lxml parsers must not be shared between threads
+_PARSERS = threading.local()
 
 ARXIV_API = 'http://export.arxiv.org/api/query'
 CATEGORIES = ['cs.AI', 'cs.CL', 'cs.CV', 'cs.LG', 'cs.MA', 'cs.NE', 'cs.RO', 'cs.SY', 'cs.TH']
+LIST_CACHE_TTL = 300  # seconds a paper list is served from memory
+DETAIL_CACHE_TTL = 900  # seconds a paper detail is served from memory
+STREAM_BUFFER_SIZE = 64 * 1024  # bytes read from the socket per call while stream-parsing
+# Paper lists for past dates, kept outside the project folder
+CACHE_DIR = os.environ.get('ARXIV_CACHE_DIR') or os.path.join(os.path.expanduser('~'), '.cache', 'arxiv_cs_daily')
+DISK_CACHE_MIN_AGE_DAYS = 3  # arXiv announces late and can still add papers to the last few days
+DISK_CACHE_TTL = 7 * 24 * 3600  # seconds a list on disk is trusted before it is fetched again
+
+# Atom tag names, built once instead of on every find() call
+_NS = '{http://www.w3.org/2005/Atom}'
+_T_ENTRY = _NS + 'entry'
+_T_ID = _NS + 'id'
+_T_TITLE = _NS + 'title'
+_T_PUB = _NS + 'published'
+_T_CAT = _NS + 'category'
+_T_AUTHOR = _NS + 'author'
+_T_NAME = _NS + 'name'
+_T_SUMMARY = _NS + 'summary'
+_T_PDF_LINK = _NS + 'link[@title="pdf"]'
+
+def _ttl_cache(ttl, maxsize):
+    """Memoize a fetcher for ttl seconds per argument tuple.
+
+    Empty results (nothing found or a failed request) are not kept, so they are retried.
+    """
+    def decorator(func):
+        cache = {}
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            with lock:
+                hit = cache.get(key)
+                if hit is not None and hit[0] > now:
+                    return hit[1]
+            result = func(*args, **kwargs)
+            if result:
+                with lock:
+                    cache.pop(key, None)
+                    cache[key] = (now + ttl, result)
+                    # Oldest entries go first
+                    while len(cache) > maxsize:
+                        del cache[next(iter(cache))]
+            return result
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+def _parse_xml(content):
+    """Parse an arXiv API response body into its root element."""
+    if not _USE_LXML:
+        return ET.fromstring(content)
+    parser = getattr(_PARSERS, 'parser', None)
+    if parser is None:
+        parser = _PARSERS.parser = ET.XMLParser(resolve_entities=False, no_network=True)
+    return ET.fromstring(content, parser)
+
+def _iter_entries(stream):
+    """Incrementally parse an arXiv API response and yield its Atom entries one at a time.
+
+    Each entry is cleared (and, with lxml, detached from the tree) once the caller moves on,
+    so memory stays flat however many results the feed has.
+    """
+    if _USE_LXML:
+        events = ET.iterparse(stream, events=('end',), tag=_T_ENTRY, resolve_entities=False, no_network=True)
+    else:
+        events = ET.iterparse(stream, events=('end',))
+    for _, elem in events:
+        if elem.tag != _T_ENTRY:
+            continue
+        yield elem
+        elem.clear()
+        if _USE_LXML:
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+
+def _cache_path(category, date):
+    """On-disk cache file for the paper list of one category on one day."""
+    return os.path.join(CACHE_DIR, f"{category or 'all'}_{date or 'latest'}.json")
+
+def _read_cached_papers(path):
+    """Load a cached paper list, or None if there is no usable (or only an expired) cache file."""
+    try:
+        if time.time() - os.stat(path).st_mtime > DISK_CACHE_TTL:
+            return None
+        with open(path, 'rb') as f:
+            return json.loads(f.read())
+    except (OSError, ValueError):
+        return None
 
+def _write_cached_papers(path, papers):
+    """Write a paper list to the cache atomically; failures only cost a future refetch."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(json.dumps(papers, ensure_ascii=False).encode('utf-8'))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        print(f"Error writing paper cache {path}: {e}")
+
+# One pooled session for all requests, so connections to arXiv are kept alive and reused
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+_SESSION.mount('http://', _ADAPTER)
+_SESSION.mount('https://', _ADAPTER)
+
+@_ttl_cache(LIST_CACHE_TTL, maxsize=128)
 def fetch_latest_papers(category=None, date=None):
     """Fetch papers from arXiv, optionally filtered by category and/or date."""
     query_parts = []
     if category and category in CATEGORIES:
         query_parts.append(f'cat:{category}')
     else:
+        category = None
         query_parts.append('cat:cs.*')
     
+    cache_path = None
     # Handle date filtering - arXiv uses submittedDate with YYYYMMDD format
     if date:
         try:
@@ -21,6 +157,12 @@ def fetch_latest_papers(category=None, date=None):
             date_str = date_obj.strftime('%Y%m%d')
             # arXiv uses date range format: submittedDate:[YYYYMMDD TO YYYYMMDD]
             query_parts.append(f'submittedDate:[{date_str} TO {date_str}]')
+            # Lists for days a few days back (in UTC, like arXiv's dates) rarely change, so they are kept on disk
+            if date_obj.date() <= datetime.now(timezone.utc).date() - timedelta(days=DISK_CACHE_MIN_AGE_DAYS):
+                cache_path = _cache_path(category, date_obj.strftime('%Y-%m-%d'))
+                papers = _read_cached_papers(cache_path)
+                if papers is not None:
+                    return papers
         except ValueError:
             print(f"Invalid date format: {date}. Using default behavior.")
     
@@ -32,94 +174,111 @@ def fetch_latest_papers(category=None, date=None):
         'sortBy': 'submittedDate',
         'sortOrder': 'descending'
     }
+    papers = []
     try:
-        response = requests.get(ARXIV_API, params=params, timeout=10)
-        response.raise_for_status()
-        root = ET.fromstring(response.content)
-        papers = []
-        
-        # Check if there are entries in the response
-        entries = root.findall('{http://www.w3.org/2005/Atom}entry')
-        if not entries:
-            print(f"No papers found for query: {search_query}")
-            return []
-        
-        for entry in entries:
-            try:
-                paper_id_elem = entry.find('{http://www.w3.org/2005/Atom}id')
-                paper_id = paper_id_elem.text.split('/')[-1] if paper_id_elem is not None else 'unknown'
-                
-                title_elem = entry.find('{http://www.w3.org/2005/Atom}title')
-                title = title_elem.text.strip() if title_elem is not None and title_elem.text else 'No title'
-                
-                published_elem = entry.find('{http://www.w3.org/2005/Atom}published')
-                published = published_elem.text if published_elem is not None else ''
-                
-                categories = [cat.get('term') for cat in entry.findall('{http://www.w3.org/2005/Atom}category')]
-                cs_categories = [c for c in categories if c.startswith('cs.')]
-                paper_field = cs_categories[0] if cs_categories else 'cs.OTHER'
-                
-                papers.append({
-                    'id': paper_id,
-                    'title': title,
-                    'submission_time': published,
-                    'field': paper_field
-                })
-            except Exception as e:
-                print(f"Error parsing paper entry: {e}")
-                continue
-                
-        return papers
-    except requests.RequestException as e:
+        with _SESSION.get(ARXIV_API, params=params, stream=True, timeout=10) as response:
+            response.raise_for_status()
+            # Let urllib3 undo any gzip transfer encoding while the parser reads
+            response.raw.decode_content = True
+            # Feed the parser large blocks rather than whatever small reads it asks for; the raw
+            # response must stay open at EOF or the buffered reader reports a closed file
+            response.raw.auto_close = False
+            stream = io.BufferedReader(response.raw, buffer_size=STREAM_BUFFER_SIZE)
+            for entry in _iter_entries(stream):
+                paper = _parse_list_entry(entry)
+                if paper is not None:
+                    papers.append(paper)
+    except (requests.RequestException, _StreamError) as e:
         print(f"Error fetching papers from arXiv: {e}")
         return []
     except ET.ParseError as e:
         print(f"Error parsing arXiv response: {e}")
         return []
 
-def fetch_paper_detail(paper_id):
-    """Fetch detailed information for a specific arXiv paper by its ID."""
-    params = {
-        'id_list': paper_id,
-        'max_results': 1
-    }
+    # Check if there are entries in the response
+    if not papers:
+        print(f"No papers found for query: {search_query}")
+    elif cache_path:
+        _write_cached_papers(cache_path, papers)
+    return papers
+
+def _parse_list_entry(entry):
+    """Build the list-view dict for one Atom entry, or None if the entry is malformed."""
     try:
-        response = requests.get(ARXIV_API, params=params, timeout=10)
-        response.raise_for_status()
-        root = ET.fromstring(response.content)
-        entry = root.find('{http://www.w3.org/2005/Atom}entry')
-        if entry is None:
-            return None
+        paper_id_elem = entry.find(_T_ID)
+        paper_id = paper_id_elem.text.split('/')[-1] if paper_id_elem is not None else 'unknown'
         
-        title_elem = entry.find('{http://www.w3.org/2005/Atom}title')
+        title_elem = entry.find(_T_TITLE)
         title = title_elem.text.strip() if title_elem is not None and title_elem.text else 'No title'
         
-        authors = []
-        for author in entry.findall('{http://www.w3.org/2005/Atom}author'):
-            name_elem = author.find('{http://www.w3.org/2005/Atom}name')
-            if name_elem is not None and name_elem.text:
-                authors.append(name_elem.text)
-        
-        published_elem = entry.find('{http://www.w3.org/2005/Atom}published')
+        published_elem = entry.find(_T_PUB)
         published = published_elem.text if published_elem is not None else ''
         
-        summary_elem = entry.find('{http://www.w3.org/2005/Atom}summary')
-        summary = summary_elem.text.strip() if summary_elem is not None and summary_elem.text else ''
-        
-        pdf_link_element = entry.find('{http://www.w3.org/2005/Atom}link[@title="pdf"]')
-        pdf_link = pdf_link_element.get('href') if pdf_link_element is not None else f'https://arxiv.org/pdf/{paper_id}.pdf'
-        
-        categories = [cat.get('term') for cat in entry.findall('{http://www.w3.org/2005/Atom}category')]
+        # The first cs.* category is the paper's field
+        paper_field = 'cs.OTHER'
+        for cat in entry.iterfind(_T_CAT):
+            term = cat.get('term')
+            if term and term.startswith('cs.'):
+                paper_field = term
+                break
         
         return {
             'id': paper_id,
             'title': title,
-            'authors': authors,
-            'submission_date': published,
-            'abstract': summary,
-            'pdf_link': pdf_link,
-            'categories': categories
+            'submission_time': published,
+            'field': paper_field
         }
+    except Exception as e:
+        print(f"Error parsing paper entry: {e}")
+        return None
+
+def _parse_detail_entry(entry, paper_id):
+    """Build the detail dict for one Atom entry of an arXiv API response."""
+    title_elem = entry.find(_T_TITLE)
+    title = title_elem.text.strip() if title_elem is not None and title_elem.text else 'No title'
+    
+    authors = []
+    for author in entry.findall(_T_AUTHOR):
+        name_elem = author.find(_T_NAME)
+        if name_elem is not None and name_elem.text:
+            authors.append(name_elem.text)
+    
+    published_elem = entry.find(_T_PUB)
+    published = published_elem.text if published_elem is not None else ''
+    
+    summary_elem = entry.find(_T_SUMMARY)
+    summary = summary_elem.text.strip() if summary_elem is not None and summary_elem.text else ''
+    
+    pdf_link_element = entry.find(_T_PDF_LINK)
+    pdf_link = pdf_link_element.get('href') if pdf_link_element is not None else f'https://arxiv.org/pdf/{paper_id}.pdf'
+    
+    categories = [cat.get('term') for cat in entry.findall(_T_CAT)]
+    
+    return {
+        'id': paper_id,
+        'title': title,
+        'authors': authors,
+        'submission_date': published,
+        'abstract': summary,
+        'pdf_link': pdf_link,
+        'categories': categories
+    }
+
+@_ttl_cache(DETAIL_CACHE_TTL, maxsize=1024)
+def fetch_paper_detail(paper_id):
+    """Fetch detailed information for a specific arXiv paper by its ID."""
+    params = {
+        'id_list': paper_id,
+        'max_results': 1
+    }
+    try:
+        response = _SESSION.get(ARXIV_API, params=params, timeout=10)
+        response.raise_for_status()
+        root = _parse_xml(response.content)
+        entry = root.find(_T_ENTRY)
+        if entry is None:
+            return None
+        return _parse_detail_entry(entry, paper_id)
     except requests.RequestException as e:
         print(f"Error fetching paper detail from arXiv: {e}")
         return None
@@ -127,13 +286,31 @@ def fetch_paper_detail(paper_id):
         print(f"Error parsing arXiv detail response: {e}")
         return None
 
+# Citation templates, filled with str.format_map
+_BIBTEX_TMPL = ("@article{{arxiv{id_clean},\n  title = {{{title}}},\n  author = {{{authors_bibtex}}},\n"
+                "  journal = {{arXiv preprint}},\n  year = {{{year}}},\n  eprint = {{{id}}},\n"
+                "  url = {{https://arxiv.org/abs/{id}}}\n}}")
+_STANDARD_TMPL = '{authors_standard}. "{title}." arXiv preprint arXiv:{id} ({date}).'
+
+@functools.lru_cache(maxsize=4096)
+def _cached_citations(paper_id, title, authors, submission_date):
+    """Render both citation strings; the inputs for an arXiv ID rarely change, so results are reused."""
+    year = submission_date[:4] if submission_date else 'YYYY'
+    fields = {
+        'id': paper_id,
+        'id_clean': paper_id.replace('.', ''),
+        'title': title,
+        'authors_bibtex': ' and '.join(authors),
+        'authors_standard': ', '.join(authors),
+        'year': year,
+        'date': submission_date[:10] if submission_date else year,
+    }
+    return _BIBTEX_TMPL.format_map(fields), _STANDARD_TMPL.format_map(fields)
+
 def generate_citations(paper):
     """Generate BibTeX and standard academic citations for a given paper."""
-    authors_str = ' and '.join(paper['authors'])
-    year = paper['submission_date'][:4] if paper['submission_date'] else 'YYYY'
-    paper_id_clean = paper['id'].replace('.', '')
-    bibtex = f"@article{{arxiv{paper_id_clean},\n  title = {{{paper['title']}}},\n  author = {{{authors_str}}},\n  journal = {{arXiv preprint}},\n  year = {{{year}}},\n  eprint = {{{paper['id']}}},\n  url = {{https://arxiv.org/abs/{paper['id']}}}\n}}"
-    standard = f"{', '.join(paper['authors'])}. \"{paper['title']}.\" arXiv preprint arXiv:{paper['id']} ({paper['submission_date'][:10] if paper['submission_date'] else year})."
+    bibtex, standard = _cached_citations(paper['id'], paper['title'], tuple(paper['authors']),
+                                         paper['submission_date'])
     return {
         'bibtex': bibtex,
         'standard': standard
@@ -2,7 +2,16 @@ from flask import Flask, render_template, request
 import arxiv_fetcher
 from datetime import datetime
 
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
 app = Flask(__name__)
+# Templates are only loaded once; no stat of every template file on each render
+app.config['TEMPLATES_AUTO_RELOAD'] = False
+if Compress is not None:
+    Compress(app)
 
 @app.context_processor
 def inject_current_year():
@@ -39,4 +48,9 @@ def page_not_found(e):
     return render_template('404.html'), 404
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    try:
+        from waitress import serve
+    except ImportError:
+        app.run(host='127.0.0.1', port=5000, threaded=True)
+    else:
+        serve(app, host='127.0.0.1', port=5000, threads=8)
\ No newline at end of file
@@ -0,0 +1,5 @@
+# Tasks live in process memory, so a single worker must serve every request;
+# threads still let slow clients overlap.
+workers = 1
+worker_class = "gthread"
+threads = 8
@@ -1,7 +1,12 @@
+import itertools
+
 from flask import Flask, render_template, request, redirect, url_for
 
 app = Flask(__name__)
-tasks = []  # In-memory storage for tasks as dictionaries with content and priority
+# Templates are only loaded once; no stat of every template file on each render
+app.config['TEMPLATES_AUTO_RELOAD'] = False
+tasks = {}  # In-memory storage for tasks: task id -> dict with content and priority, in insertion order
+_next_id = itertools.count(1)
 
 @app.route('/')
 def index():
@@ -15,17 +20,15 @@ def add():
         # Ensure priority is one of the valid options
         if priority not in ['high', 'medium', 'low']:
             priority = 'medium'  # default to medium if invalid
-        tasks.append({'content': task_content.strip(), 'priority': priority})
+        tasks[next(_next_id)] = {'content': task_content.strip(), 'priority': priority}
     return redirect(url_for('index'))
 
 @app.route('/delete', methods=['POST'])
 def delete():
-    task_index = request.form.get('index')
-    if task_index and task_index.isdigit():
-        index_int = int(task_index)
-        if 0 <= index_int < len(tasks):
-            del tasks[index_int]
+    task_id = request.form.get('id')
+    if task_id and task_id.isdigit():
+        tasks.pop(int(task_id), None)
     return redirect(url_for('index'))
 
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    app.run()
\ No newline at end of file
@@ -1,6 +1,18 @@
 from agent import run_project, error_project, modify_project, project_project, generate_project
+from project_generator import prefetch_project_structure
 import os
 
+
+def _input_need(former_message, project_root=None):
+    """
+    Ask for the next modification need. While the user types, the project's directory tree is
+    built in the background; it is returned along with the input for modify_project.
+    """
+    prefetch = prefetch_project_structure(former_message, project_root)
+    user_input = input("\nType your modification need or type 'exit' to exit:").strip()
+    return user_input, prefetch.result()
+
+
 def main1(prompt):
     # First generation
     code_first_result = generate_project(code_mission=prompt)
@@ -28,8 +40,13 @@ def main1(prompt):
     print("=" * 50)
 
     while True:
+        # Get current messages
+        current_messages = (code_round_result.get("messages")
+                            if code_round_result
+                            else code_first_result.get("messages"))
+
         # Get user input
-        user_input = input("\nType your modification need or type 'exit' to exit:").strip()
+        user_input, project_structure = _input_need(current_messages)
 
         if user_input.lower() == 'exit':
             break
@@ -38,14 +55,9 @@ def main1(prompt):
             # User has new modification requirements
             print(f"\n=== Handling your need: {user_input} ===")
 
-            # Get current messages
-            current_messages = (code_round_result.get("messages")
-                                if code_round_result
-                                else code_first_result.get("messages"))
-
             # Modify project
-            modify_result = modify_project(former_message=current_messages, modify_message=user_input
-            )
+            modify_result = modify_project(former_message=current_messages, modify_message=user_input,
+                                           project_structure=project_structure)
 
             # Run modified project
             print("\n=== Running modified project ===")
@@ -98,8 +110,13 @@ def main2(prompt, project_folder):
     print("=" * 50)
 
     while True:
+        # Get current messages
+        current_messages = (code_round_result.get("messages")
+                            if code_round_result
+                            else code_first_result.get("messages"))
+
         # Get user input
-        user_input = input("\nType your modification need or type 'exit' to exit:").strip()
+        user_input, project_structure = _input_need(current_messages, parent_folder)
 
         if user_input.lower() == 'exit':
             break
@@ -108,14 +125,9 @@ def main2(prompt, project_folder):
             # User has new modification requirements
             print(f"\n=== Handling your need: {user_input} ===")
 
-            # Get current messages
-            current_messages = (code_round_result.get("messages")
-                                if code_round_result
-                                else code_first_result.get("messages"))
-
             # Modify project
             modify_result = modify_project(former_message=current_messages, modify_message=user_input
-                                           , project_root=parent_folder)
+                                           , project_root=parent_folder, project_structure=project_structure)
             print(modify_result.get("messages"))
             # Run modified project
             print("\n=== Running modified project ===")
@@ -1,40 +1,140 @@
 """
 Project Generator Module
 """
-import json
 import os
+import re
 import shutil
-from file_utils import ensure_directory, save_project_json, get_directory_tree, process_json_request
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from file_utils import ensure_directory, save_project_json, get_directory_tree, process_json_request, \
+    collect_traceback_files, invalidate_directory_tree, dumps_json_compact, ReadPrefetcher
 from dependency_manager import install_requirements
 from ai_utils import get_first_response, get_error_response, get_modify_response, get_project_response, \
-    code_detail_feedback
-from config import DEEPSEEK_API_KEY, DEEPSEEK_BASE_URL, DEEPSEEK_MODEL
+    code_detail_feedback, get_batch_modify_response
+from config import DEEPSEEK_API_KEY, DEEPSEEK_BASE_URL, DEEPSEEK_MODEL, DEFAULT_PROJECT_ROOT
 from pathlib import Path
 
 
+# Everything but ASCII letters, digits and "_" becomes "_" in folder names
+_SAN_RE = re.compile(r'[^a-zA-Z0-9_]')
+_SAN_TABLE = str.maketrans({chr(c): '_' for c in range(128) if not (chr(c).isalnum() or chr(c) == '_')})
+
+
 def _get_project_folder_name(project_data):
     """Ensure project_folder_name is valid"""
-    import re
-    name = project_data.get("project_folder_name", "") or "generated_project"
-    name = re.sub(r'[^a-zA-Z0-9_]', '_', name.strip())
+    name = (project_data.get("project_folder_name", "") or "generated_project").strip()
+    # translate() covers the usual ASCII names in C; other characters need the regex
+    name = name.translate(_SAN_TABLE) if name.isascii() else _SAN_RE.sub('_', name)
     return name or "generated_project"
 
 
-def create_project_structure(base_dir, project_data):
+_FOLDER_NAME_RE = re.compile(r'"project_folder_name"\s*:\s*"([^"]*)"')
+
+
+def _previous_project_structure(former_message, project_root):
+    """
+    Directory tree of the project the conversation has been working on, or None.
+    Sent with the next request so the model can name every file it needs to read at once.
+    """
+    if not project_root:
+        return None
+    for message in reversed(former_message or []):
+        if message.get("role") != "assistant":
+            continue
+        match = _FOLDER_NAME_RE.search(message.get("content") or "")
+        if match:
+            project_folder = os.path.join(os.path.abspath(project_root),
+                                          _get_project_folder_name({"project_folder_name": match.group(1)}))
+            return get_directory_tree(project_folder) if os.path.isdir(project_folder) else None
+    return None
+
+
+def prefetch_project_structure(former_message, project_root=None):
+    """
+    Start building the directory tree of the conversation's project on a background thread.
+    Returns a Future; pass its result to generate_modify_project as project_structure.
+    """
+    future = Future()
+
+    def build():
+        try:
+            future.set_result(_previous_project_structure(former_message, project_root or DEFAULT_PROJECT_ROOT))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=build, daemon=True).start()
+    return future
+
+
+def _has_read_op(data):
+    """Whether the reply asks to read any file; stops at the first read entry instead of stringifying the reply"""
+    if isinstance(data, dict):
+        return data.get("operation") == "read" or any(_has_read_op(value) for value in data.values())
+    if isinstance(data, list):
+        return any(_has_read_op(item) for item in data)
+    return False
+
+
+def _file_unchanged(file_path, data):
+    """Whether file_path already holds exactly the bytes data"""
+    try:
+        # Size first: a changed file almost always differs in length, and that costs no read
+        if file_path.stat().st_size != len(data):
+            return False
+        return file_path.read_bytes() == data
+    except OSError:
+        return False
+
+
+def _write_file(file_path, code, force):
+    """
+    Write one generated file as UTF-8 bytes in a single write, unless it is unchanged since the last round.
+    Newlines are written as given (no text-mode translation).
+    """
+    data = code.encode('utf-8')
+    if force or not _file_unchanged(file_path, data):
+        with open(file_path, 'wb', buffering=0) as f:
+            view = memoryview(data)
+            while view:
+                view = view[f.write(view):]
+
+
+def _flush_writes(pending_writes, force):
+    """
+    Write the collected {path: code} files, several at once since file I/O releases the GIL,
+    then clear the collection. Errors from any write are raised here.
+    """
+    # One mkdir per distinct directory rather than one per file
+    for parent in {path.parent for path in pending_writes}:
+        parent.mkdir(parents=True, exist_ok=True)
+    if len(pending_writes) > 1:
+        with ThreadPoolExecutor(max_workers=min(32, len(pending_writes))) as executor:
+            futures = [executor.submit(_write_file, path, code, force) for path, code in pending_writes.items()]
+        for future in futures:
+            future.result()
+    else:
+        for path, code in pending_writes.items():
+            _write_file(path, code, force)
+    pending_writes.clear()
+
+
+def create_project_structure(base_dir, project_data, force=False):
     """
     Create project folder structure and files based on JSON data
 
     Args:
         base_dir (str): Base directory path
         project_data (dict): JSON data containing project structure
+        force (bool): Rewrite every file, even those whose content on disk is already identical
 
     Returns:
         tuple: (status_code, file_list, project_type, requirements_path, main_path) or (status_code, None, None, None, None)
     """
     try:
         # Check if project folder exists, create if not
-        if not Path(base_dir).exists():
-            Path(base_dir).mkdir(parents=True, exist_ok=True)
+        base = Path(base_dir)
+        if not base.exists():
+            base.mkdir(parents=True, exist_ok=True)
 
         # Parse file list
         file_list = project_data["out_file"]
@@ -44,18 +144,20 @@ def create_project_structure(base_dir, project_data):
         requirements_path = None
         file_name_list = []
 
+        # Consecutive writes are collected and flushed together; a delete flushes first, so the
+        # operations still take effect in the order they were given
+        pending_writes = {}
+
         # Create or delete files
         for file_info in file_list:
             file_name = file_info["file_name"]
             operation = file_info["operation"]
-            file_path = Path(base_dir) / file_name
+            file_path = base / file_name
 
             if operation == "write":
-                # Write file
-                file_path.parent.mkdir(parents=True, exist_ok=True)
-
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(file_info["code"])
+                # A later write of the same path replaces an earlier one
+                pending_writes.pop(file_path, None)
+                pending_writes[file_path] = file_info["code"]
 
                 file_name_list.append(file_name)
 
@@ -64,48 +166,55 @@ def create_project_structure(base_dir, project_data):
                     requirements_path = str(file_path)
 
             elif operation == "delete":
+                _flush_writes(pending_writes, force)
                 # Delete file
                 if file_path.exists():
                     if file_path.is_file():
                         file_path.unlink()
                     elif file_path.is_dir():
                         shutil.rmtree(file_path)
+        _flush_writes(pending_writes, force)
         return "success", file_name_list, project_type, requirements_path
 
     except Exception as e:
         print(f"Error processing project structure: {e}")
         return "error", None, None, None
+    finally:
+        invalidate_directory_tree(base_dir)
 
 
-def generate_initial_project(code_mission, project_root=None, api_key=None,
-                             base_url=None,
-                             model=None,
-                             auto_install=True,
-                             use_conda=False,
-                             conda_env_name=None):
-    """
-    Generate complete project
+def _drain_read_requests(project_data, messages, actual_project_root, api_key, base_url, model,
+                         prefetched=None):
     """
-    api_key = api_key or DEEPSEEK_API_KEY
-    base_url = base_url or DEEPSEEK_BASE_URL
-    model = model or DEEPSEEK_MODEL
+    Answer the model's read requests until it replies with files to write
 
-    print("\n=== Generating project ===")
-    error_result, project_data, messages = get_first_response(
-        code_mission=code_mission,
-        api_key=api_key,
-        base_url=base_url,
-        model=model
-    )
-    if error_result == 'error':
-        return error_result
+    Each follow-up reply is streamed through a ReadPrefetcher, so the files it asks for are
+    already being read while the rest of the reply arrives.
 
-    # Determine folder name and create root directory
-    project_folder_name = _get_project_folder_name(project_data)
+    Returns:
+        tuple: (status, project_data, messages)
+    """
+    while _has_read_op(project_data):
+        code_detail = dumps_json_compact(process_json_request(project_data, actual_project_root, prefetched))
+        prefetched = ReadPrefetcher(actual_project_root)
+        try:
+            error_result, project_data, messages = code_detail_feedback(
+                former_message=messages, code_detail=code_detail, api_key=api_key, base_url=base_url,
+                model=model, on_item=prefetched
+            )
+        finally:
+            prefetched.close()
+        if error_result == 'error':
+            return error_result, project_data, messages
+    return "success", project_data, messages
 
-    actual_project_root = os.path.join(os.path.abspath(project_root), project_folder_name)
-    ensure_directory(actual_project_root)
 
+def _finalize(project_data, messages, actual_project_root, project_folder_name,
+              auto_install=True, use_conda=False, conda_env_name=None):
+    """
+    Shared tail of every generate_* entry point: write the files, install the requirements,
+    save project_detail.json and build the result dictionary
+    """
     # Create program files and save code
     create_state, file_name_list, project_type, require_path = create_project_structure(actual_project_root,
                                                                                         project_data)
@@ -115,28 +224,60 @@ def generate_initial_project(code_mission, project_root=None, api_key=None,
             "stage": "creation",
             "error": "failed to create project"
         }
+    # require_path is already the absolute path create_project_structure wrote to
     if require_path:
-        requirements_path = os.path.join(actual_project_root, Path(require_path))
         # Auto-install dependencies
         if auto_install:
             install_requirements(
-                requirements_path=requirements_path,
+                requirements_path=require_path,
                 auto_install=auto_install,
                 use_conda=use_conda,
                 conda_env_name=conda_env_name
             )
     # Save original project data (JSON format)
     save_project_json(project_data, actual_project_root)
-    # Modified version
     return {
         "success": "success",
         "project_root": actual_project_root,  # main is at this level
         "project_folder_name": project_folder_name,
         "project_type": project_type,
-        "messages": messages,  # First round conversation
+        "messages": messages,  # Conversation so far
     }
 
 
+def generate_initial_project(code_mission, project_root=None, api_key=None,
+                             base_url=None,
+                             model=None,
+                             auto_install=True,
+                             use_conda=False,
+                             conda_env_name=None):
+    """
+    Generate complete project
+    """
+    api_key = api_key or DEEPSEEK_API_KEY
+    base_url = base_url or DEEPSEEK_BASE_URL
+    model = model or DEEPSEEK_MODEL
+
+    print("\n=== Generating project ===")
+    error_result, project_data, messages = get_first_response(
+        code_mission=code_mission,
+        api_key=api_key,
+        base_url=base_url,
+        model=model
+    )
+    if error_result == 'error':
+        return error_result
+
+    # Determine folder name and create root directory
+    project_folder_name = _get_project_folder_name(project_data)
+
+    actual_project_root = os.path.join(os.path.abspath(project_root), project_folder_name)
+    ensure_directory(actual_project_root)
+
+    return _finalize(project_data, messages, actual_project_root, project_folder_name,
+                     auto_install, use_conda, conda_env_name)
+
+
 def generate_error_project(former_message, error_message, project_root=None, api_key=None,
                            base_url=None, model=None, auto_install=True,
                            use_conda=False, conda_env_name=None):
@@ -147,13 +288,19 @@ def generate_error_project(former_message, error_message, project_root=None, api
     base_url = base_url or DEEPSEEK_BASE_URL
     model = model or DEEPSEEK_MODEL
 
+    # Send the files named in the traceback along with the error to skip a read round
+    traceback_files = collect_traceback_files(error_message, project_root)
+    code_detail = dumps_json_compact(traceback_files) if traceback_files else None
+
     print("\n=== Generating project ===")
     error_result, project_data, messages = get_error_response(
         former_message=former_message,
         error_message=error_message,
         api_key=api_key,
         base_url=base_url,
-        model=model
+        model=model,
+        code_detail=code_detail,
+        project_structure=_previous_project_structure(former_message, project_root)
     )
     if error_result == 'error':
         return error_result
@@ -164,63 +311,40 @@ def generate_error_project(former_message, error_message, project_root=None, api
     ensure_directory(actual_project_root)
 
     # Loop until LLM retrieves all the needed code
-    read_file_status = "'operation': 'read'" in str(project_data)
-    while read_file_status:
-        code_detail = json.dumps(process_json_request(project_data, actual_project_root), indent=2, ensure_ascii=False)
-        error_result, project_data, messages = code_detail_feedback(
-            former_message=messages, code_detail=code_detail, api_key=api_key, base_url=base_url, model=model
-        )
-        if error_result == 'error':
-            return error_result
-        read_file_status = "'operation': 'read'" in str(project_data)
+    error_result, project_data, messages = _drain_read_requests(project_data, messages, actual_project_root,
+                                                                api_key, base_url, model)
+    if error_result == 'error':
+        return error_result
 
-    # Create program files and save code
-    create_state, file_name_list, project_type, require_path = create_project_structure(actual_project_root,
-                                                                                        project_data)
-    if create_state == "error":
-        return {
-            "success": False,
-            "stage": "creation",
-            "error": "failed to create project"
-        }
-    if require_path:
-        requirements_path = os.path.join(actual_project_root, Path(require_path))
-        # Auto-install dependencies
-        if auto_install:
-            install_requirements(
-                requirements_path=requirements_path,
-                auto_install=auto_install,
-                use_conda=use_conda,
-                conda_env_name=conda_env_name
-            )
-    # Save original project data (JSON format)
-    save_project_json(project_data, actual_project_root)
-    return {
-        "success": "success",
-        "project_root": actual_project_root,  # main is at this level
-        "project_folder_name": project_folder_name,
-        "project_type": project_type,
-        "messages": messages,  # Previous conversation
-    }
+    return _finalize(project_data, messages, actual_project_root, project_folder_name,
+                     auto_install, use_conda, conda_env_name)
 
 
 def generate_modify_project(former_message, modify_message, project_root=None, api_key=None,
                             base_url=None, model=None, auto_install=True,
-                            use_conda=False, conda_env_name=None):
+                            use_conda=False, conda_env_name=None, project_structure=None):
     """
     Main function to fix project
+
+    project_structure, if already built (see prefetch_project_structure), is sent as is
+    instead of walking the project folder again.
     """
     api_key = api_key or DEEPSEEK_API_KEY
     base_url = base_url or DEEPSEEK_BASE_URL
     model = model or DEEPSEEK_MODEL
 
+    # A list of needs is sent as one batched request
+    get_response = get_batch_modify_response if isinstance(modify_message, (list, tuple)) else get_modify_response
+
     print("\n=== Generating project ===")
-    error_result, project_data, messages = get_modify_response(
-        former_message=former_message,
-        modify_message=modify_message,
+    error_result, project_data, messages = get_response(
+        former_message,
+        modify_message,
         api_key=api_key,
         base_url=base_url,
-        model=model
+        model=model,
+        project_structure=(project_structure if project_structure is not None
+                           else _previous_project_structure(former_message, project_root))
     )
     if error_result == 'error':
         return error_result
@@ -230,45 +354,14 @@ def generate_modify_project(former_message, modify_message, project_root=None, a
     actual_project_root = os.path.join(os.path.abspath(project_root), project_folder_name)
     ensure_directory(actual_project_root)
 
-    # Loop until LLM retrieves all the needed coed
-    read_file_status = "'operation': 'read'" in str(project_data)
-    while read_file_status:
-        code_detail = json.dumps(process_json_request(project_data, actual_project_root), indent=2, ensure_ascii=False)
-        error_result, project_data, messages = code_detail_feedback(
-            former_message=messages, code_detail=code_detail, api_key=api_key, base_url=base_url, model=model
-        )
-        if error_result == 'error':
-            return error_result
-        read_file_status = "'operation': 'read'" in str(project_data)
+    # Loop until LLM retrieves all the needed code
+    error_result, project_data, messages = _drain_read_requests(project_data, messages, actual_project_root,
+                                                                api_key, base_url, model)
+    if error_result == 'error':
+        return error_result
 
-    # Create program files and save code
-    create_state, file_name_list, project_type, require_path = create_project_structure(actual_project_root,
-                                                                                        project_data)
-    if create_state == "error":
-        return {
-            "success": False,
-            "stage": "creation",
-            "error": "failed to create project"
-        }
-    if require_path:
-        requirements_path = os.path.join(actual_project_root, Path(require_path))
-        # Auto-install dependencies
-        if auto_install:
-            install_requirements(
-                requirements_path=requirements_path,
-                auto_install=auto_install,
-                use_conda=use_conda,
-                conda_env_name=conda_env_name
-            )
-    # Save original project data (JSON format)
-    save_project_json(project_data, actual_project_root)
-    return {
-        "success": "success",
-        "project_root": actual_project_root,  # main is at this level
-        "project_folder_name": project_folder_name,
-        "project_type": project_type,
-        "messages": messages,  # Previous conversation
-    }
+    return _finalize(project_data, messages, actual_project_root, project_folder_name,
+                     auto_install, use_conda, conda_env_name)
 
 
 def generate_project_project(code_mission, project_folder, api_key=None,
@@ -285,14 +378,27 @@ def generate_project_project(code_mission, project_folder, api_key=None,
     model = model or DEEPSEEK_MODEL
 
     project_structure = get_directory_tree(project_folder)
+    # main.py is always read before writing, so send it with the first prompt
+    code_detail = None
+    if os.path.isfile(os.path.join(project_folder, "main.py")):
+        main_file = process_json_request({"out_file": [{"file_name": "main.py", "operation": "read"}]},
+                                         project_folder)
+        code_detail = dumps_json_compact(main_file.get("corresponding_code", []))
+
     print("\n=== Generating project ===")
-    error_result, project_data, messages = get_project_response(
-        code_mission=code_mission,
-        project_structure=project_structure,
-        api_key=api_key,
-        base_url=base_url,
-        model=model
-    )
+    prefetched = ReadPrefetcher(project_folder)
+    try:
+        error_result, project_data, messages = get_project_response(
+            code_mission=code_mission,
+            project_structure=project_structure,
+            api_key=api_key,
+            base_url=base_url,
+            model=model,
+            code_detail=code_detail,
+            on_item=prefetched
+        )
+    finally:
+        prefetched.close()
     print(project_data)
     if error_result == 'error':
         return error_result
@@ -303,43 +409,10 @@ def generate_project_project(code_mission, project_folder, api_key=None,
     ensure_directory(actual_project_root)
 
     # Loop until LLM retrieves all the needed code
-    read_file_status = "'operation': 'read'" in str(project_data)
-    while read_file_status:
-        code_detail = json.dumps(process_json_request(project_data, actual_project_root), indent=2, ensure_ascii=False)
-        error_result, project_data, messages = code_detail_feedback(
-            former_message=messages, code_detail=code_detail, api_key=api_key, base_url=base_url, model=model
-        )
-
-        if error_result == 'error':
-            return error_result
-        read_file_status = "'operation': 'read'" in str(project_data)
+    error_result, project_data, messages = _drain_read_requests(project_data, messages, actual_project_root,
+                                                                api_key, base_url, model, prefetched)
+    if error_result == 'error':
+        return error_result
 
-    # Create program files and save code
-    create_state, file_name_list, project_type, require_path = create_project_structure(actual_project_root,
-                                                                                        project_data)
-    if create_state == "error":
-        return {
-            "success": False,
-            "stage": "creation",
-            "error": "failed to create project"
-        }
-    if require_path:
-        requirements_path = os.path.join(actual_project_root, Path(require_path))
-        # Auto-install dependencies
-        if auto_install:
-            install_requirements(
-                requirements_path=requirements_path,
-                auto_install=auto_install,
-                use_conda=use_conda,
-                conda_env_name=conda_env_name
-            )
-    # Save original project data (JSON format)
-    save_project_json(project_data, actual_project_root)
-    # Modified version
-    return {
-        "success": "success",
-        "project_root": actual_project_root,  # main is at this level
-        "project_folder_name": project_folder_name,
-        "project_type": project_type,
-        "messages": messages,  # First round conversation
-    }
+    return _finalize(project_data, messages, actual_project_root, project_folder_name,
+                     auto_install, use_conda, conda_env_name)
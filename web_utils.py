@@ -1,64 +1,247 @@
 """
 Web-related utility functions
 """
+import errno
+import importlib.util
+import re
+import selectors
+import signal
 import socket
 import subprocess
 import threading
+import time
 import webbrowser
 import sys
 import os
 import psutil
+from urllib.parse import urlsplit
+
+from config import USE_GUNICORN, GUNICORN_PORT, GUNICORN_WORKERS, GUNICORN_THREADS
+
+
+# Module-level Flask application, e.g. "app = Flask(__name__)"
+_FLASK_APP_RE = re.compile(r'^(\w+)\s*=\s*(?:flask\.)?Flask\(', re.MULTILINE)
+
+
+def _gunicorn_command(abs_filepath):
+    """
+    Command serving the file's Flask app with gunicorn, or None when gunicorn is disabled,
+    not installed, or the file does not define a module-level Flask app.
+    Gunicorn imports the module, so setup placed under `if __name__ == "__main__":` does not run.
+    """
+    if not USE_GUNICORN or os.name == "nt" or importlib.util.find_spec("gunicorn") is None:
+        return None
+    try:
+        with open(abs_filepath, 'r', encoding='utf-8') as f:
+            match = _FLASK_APP_RE.search(f.read())
+    except OSError:
+        return None
+    if not match:
+        return None
+
+    module_name = os.path.splitext(os.path.basename(abs_filepath))[0]
+    # --preload imports the app once in the master; workers fork from it instead of each importing it again
+    cmd = [sys.executable, "-m", "gunicorn", "--preload", "-b", f"127.0.0.1:{GUNICORN_PORT}"]
+    # A gunicorn.conf.py shipped with the project decides its own pool size. Otherwise one process
+    # with threads: generated apps often keep state in module globals, which separate worker
+    # processes would each hold their own copy of
+    if not os.path.exists(os.path.join(os.path.dirname(abs_filepath), "gunicorn.conf.py")):
+        cmd += ["-w", str(GUNICORN_WORKERS or 1), "-k", "gthread", "--threads", str(GUNICORN_THREADS)]
+    cmd.append(f"{module_name}:{match.group(1)}")
+    return cmd
+
+
+if os.name == "nt":
+    _NEW_GROUP_KWARGS = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+else:
+    _NEW_GROUP_KWARGS = {"start_new_session": True}
 
 
 def _start_web_process(abs_filepath):
     return subprocess.Popen(
-        [sys.executable, abs_filepath],
+        _gunicorn_command(abs_filepath) or [sys.executable, abs_filepath],
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,  # stderr merged into stdout
-        text=True,
-        encoding='utf-8',
-        bufsize=1,
-        cwd=os.path.dirname(abs_filepath)
+        bufsize=0,  # raw pipe; _create_output_reader_thread reads and decodes it in chunks
+        cwd=os.path.dirname(abs_filepath),
+        # Own process group, so _kill_process_tree can signal reloader children / workers in one call
+        **_NEW_GROUP_KWARGS
     )
 
 # ---------------- Port detection ----------------
+# connect_ex codes for a non-blocking connect still in progress; Windows reports WSAEWOULDBLOCK (10035)
+_CONNECT_PENDING = {code for code in (errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN,
+                                      getattr(errno, "WSAEWOULDBLOCK", None)) if code is not None}
+
 def _is_port_open(host, port, timeout=0.2):
+    """
+    Non-blocking single-port probe; a refused connection returns immediately instead of costing a full timeout
+    """
+    return _find_open_port(host, [port], timeout) is not None
+
+def _find_open_port(host, ports, timeout=0.2):
+    """
+    Probe all ports at once with non-blocking connects.
+    Returns the first port (in the given order) that accepts a connection, or None.
+    """
+    selector = selectors.DefaultSelector()
+    sockets = []
+    open_ports = set()
     try:
-        with socket.create_connection((host, port), timeout=timeout):
-            return True
-    except Exception:
-        return False
+        for port in ports:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sockets.append(sock)
+            sock.setblocking(False)
+            err = sock.connect_ex((host, port))
+            if err == 0:
+                open_ports.add(port)
+            elif err in _CONNECT_PENDING:
+                selector.register(sock, selectors.EVENT_WRITE, port)
+
+        # A socket turns writable once its connect has completed, successfully or not.
+        # Windows signals a refused connect as an exceptional condition instead; the stdlib
+        # SelectSelector there also selects write fds for exceptions and reports them as EVENT_WRITE
+        while selector.get_map():
+            events = selector.select(timeout)
+            if not events:
+                break
+            for key, _ in events:
+                if key.fileobj.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0:
+                    open_ports.add(key.data)
+                selector.unregister(key.fileobj)
+    finally:
+        selector.close()
+        for sock in sockets:
+            sock.close()
+
+    return next((port for port in ports if port in open_ports), None)
 
 # ---------------- Real-time output reading ----------------
-def _create_output_reader_thread(process, output_lines):
+# Address banner printed by Flask / Werkzeug ("Running on"), Uvicorn ("Uvicorn running on"),
+# gunicorn ("Listening at:"), waitress ("Serving on"), Django ("server at"), Streamlit ("Local URL:").
+# Only these count: any other URL in the output (e.g. an upstream API being fetched) is not the server.
+_SERVER_URL_RE = re.compile(
+    r'(?:running on|listening at:?|listening on|serving on|server at|local url:|network url:)\s*'
+    r'https?://(?:localhost|[\d.]+):(\d+)',
+    re.IGNORECASE
+)
+
+
+_READ_CHUNK = 64 * 1024
+
+
+def _create_output_reader_thread(process, output_lines, line_queue=None,
+                                 started_event=None, url_container=None, echo=True):
+    """
+    Echo (unless echo is False) and record the process output; if line_queue is given, every line
+    is also put there for a consumer, followed by None once the output is exhausted.
+    The first server address announced in a startup banner is stored in url_container["server_url"]
+    and started_event is set, so a waiter wakes up as soon as the framework announces it.
+    The pipe is read in 64 KiB chunks with os.read and split into lines here, rather than
+    with one readline() call per line.
+    """
+    def handle_lines(lines):
+        for line in lines:
+            output_lines.append(line)
+            if started_event is not None and not started_event.is_set():
+                m = _SERVER_URL_RE.search(line)
+                if m:
+                    # 0.0.0.0 / LAN addresses are reached through loopback
+                    url_container["server_url"] = f"http://127.0.0.1:{m.group(1)}"
+                    started_event.set()
+            if line_queue is not None:
+                line_queue.put(line)
+        if echo:
+            sys.stdout.write("".join(line + "\n" for line in lines))
+            sys.stdout.flush()
+
     def read_output():
+        fd = process.stdout.fileno()
+        pending = b""
         while True:
-            line = process.stdout.readline()
-            if not line and process.poll() is not None:
+            try:
+                chunk = os.read(fd, _READ_CHUNK)
+            except OSError:
                 break
-            if line:
-                line = line.rstrip()
-                output_lines.append(line)
-                print(line, flush=True)
+            if not chunk:
+                break
+            # "\n" never occurs inside a multi-byte UTF-8 sequence, so splitting bytes is safe
+            *complete, pending = (pending + chunk).split(b"\n")
+            if complete:
+                handle_lines([raw.decode('utf-8', 'replace').rstrip() for raw in complete])
+        if pending:
+            handle_lines([pending.decode('utf-8', 'replace').rstrip()])
+        if line_queue is not None:
+            line_queue.put(None)
     t = threading.Thread(target=read_output, daemon=True)
     t.start()
     return t
 
 # ---------------- Browser opening ----------------
-def _open_browser_if_needed(url, open_browser):
-    if open_browser:
-        try:
-            webbrowser.open(url)
-        except Exception as e:
-            print(f"can't open browser: {e}")
+# URLs already opened in a browser during this run; a restarted server on the same address
+# is reached by refreshing that tab, so modify rounds don't pile up new tabs
+_OPENED_URLS = set()
+
+
+def _open_browser_if_needed(url, open_browser, attempts=50, interval=0.1):
+    """
+    Open url once per run, after its port accepts connections (polled up to attempts * interval seconds)
+    """
+    if not open_browser or url in _OPENED_URLS:
+        return
+    parts = urlsplit(url)
+    host, port = parts.hostname or "127.0.0.1", parts.port or 80
+    for _ in range(attempts):
+        if _is_port_open(host, port):
+            break
+        time.sleep(interval)
+    else:
+        print(f"Server at {url} is not accepting connections, not opening browser")
+        return
+    try:
+        webbrowser.open(url)
+        _OPENED_URLS.add(url)
+    except Exception as e:
+        print(f"can't open browser: {e}")
 
 # ---------------- Process termination ----------------
-def _kill_process_tree(proc):
+def _kill_process_tree(proc, timeout=2):
+    """
+    Stop proc and everything it spawned: SIGTERM, then SIGKILL after timeout seconds.
+    On POSIX a process started by _start_web_process leads its own process group, which is
+    signalled as a whole; otherwise the tree is walked with psutil.
+    """
+    if os.name != "nt":
+        try:
+            os.killpg(proc.pid, signal.SIGTERM)
+        except (ProcessLookupError, PermissionError):
+            # Not a group leader we created (or already gone): fall back to the tree walk
+            pass
+        else:
+            try:
+                proc.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                pass
+            try:
+                # Leftover group members (e.g. a reloader child) go too
+                os.killpg(proc.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                pass
+            return
+
     try:
         parent = psutil.Process(proc.pid)
-        for child in parent.children(recursive=True):
-            child.terminate()
-        parent.terminate()
+        procs = parent.children(recursive=True) + [parent]
     except psutil.NoSuchProcess:
-        pass
-
+        return
+    for p in procs:
+        try:
+            p.terminate()
+        except psutil.NoSuchProcess:
+            pass
+    _, alive = psutil.wait_procs(procs, timeout=timeout)
+    for p in alive:
+        try:
+            p.kill()
+        except psutil.NoSuchProcess:
+            pass